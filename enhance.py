@@ -328,6 +328,10 @@ class FragmentProcessor:
         return False
 
 
+# FragmentProcessor holds no per-call state, so one instance serves every request
+fragment_processor = FragmentProcessor()
+
+
 # Enhancement style prompts with fragment awareness
 ENHANCEMENT_PROMPTS = {
     "concise": """You are a prompt optimization expert. The following voice transcript may contain over-punctuated sentence fragments due to transcription errors.
@@ -371,6 +375,13 @@ Note: Input may look like "So I want. To create. A machine learning. Model that.
 Important: Preserve technical terms, abbreviations (Ph.D., e.g.), decimals, times, URLs, and maintain legitimate list structures.""",
 }
 
+# Verbosity level requested for each enhancement style (models that support it)
+STYLE_VERBOSITY = {"concise": "low", "balanced": "medium", "detailed": "high"}
+
+# Cost estimation heuristics: system prompt overhead and expected output/input ratio
+SYSTEM_PROMPT_TOKENS = 50
+OUTPUT_TOKEN_RATIO = 1.5
+
 
 def estimate_tokens(text: str) -> int:
     """Rough estimate of token count (1 token ≈ 4 characters)"""
@@ -434,7 +445,6 @@ def enhance_prompt(
 
     # Pre-process fragments if enabled
     if fragment_processing_enabled:
-        fragment_processor = FragmentProcessor()
         processed_transcript = fragment_processor.reconstruct_fragments(transcript)
     else:
         processed_transcript = transcript
@@ -504,8 +514,7 @@ def enhance_prompt(
             and "gpt-5" not in model_config.model_name
         ):
             # Only add verbosity for future models that properly support it
-            verbosity_map = {"concise": "low", "balanced": "medium", "detailed": "high"}
-            call_params["verbosity"] = verbosity_map.get(style, "medium")
+            call_params["verbosity"] = STYLE_VERBOSITY.get(style, "medium")
 
         # Add reasoning_effort parameter for GPT-5 models
         # IMPORTANT: GPT-5 has a bug where reasoning_effort='medium' or 'high'
@@ -646,8 +655,8 @@ def estimate_enhancement_cost(transcript: str, model_name: str = None) -> float:
         return 0.0
 
     # Estimate tokens (rough approximation)
-    input_tokens = estimate_tokens(transcript) + 50  # Add system prompt tokens
-    output_tokens = min(input_tokens * 1.5, config.max_tokens_value)  # Estimate output
+    input_tokens = estimate_tokens(transcript) + SYSTEM_PROMPT_TOKENS
+    output_tokens = min(input_tokens * OUTPUT_TOKEN_RATIO, config.max_tokens_value)
 
     return config.estimate_cost(input_tokens, output_tokens)
 
@@ -77,9 +77,9 @@ class EnhancementBuilder:
         if config.get("enabled", True):
             try:
                 # Import here to avoid circular dependency
-                from enhance import FragmentProcessor
+                from enhance import fragment_processor
 
-                self.fragment_processor = FragmentProcessor()
+                self.fragment_processor = fragment_processor
                 self.processed_transcript = self.fragment_processor.reconstruct_fragments(self.transcript)
                 self._log_fragment_processing()
             except (ImportError, AttributeError) as e:
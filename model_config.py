@@ -7,14 +7,19 @@ compatibility, and graceful fallback for breaking API changes.
 """
 
 import logging
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses need Python 3.10+; older interpreters fall back to a plain dataclass
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class ModelConfig:
     """Configuration for a specific OpenAI model"""
 
@@ -387,6 +392,7 @@ class ModelRegistry:
     def register(self, config: ModelConfig) -> None:
         """Register a new model configuration"""
         self.models[config.model_name] = config
+        self.__dict__.pop("by_tier", None)  # Invalidate cached tier grouping
         logger.info(f"Registered model: {config.display_name} ({config.model_name})")
 
     def get(self, model_name: str) -> Optional[ModelConfig]:
@@ -427,6 +433,14 @@ class ModelRegistry:
 
         return fallback_chains.get(model_name, [model_name, "gpt-4o-mini"])
 
+    @cached_property
+    def by_tier(self) -> Dict[str, List[ModelConfig]]:
+        """All registered models grouped by tier, built once per registration change"""
+        grouped: Dict[str, List[ModelConfig]] = {}
+        for model in self.models.values():
+            grouped.setdefault(model.tier, []).append(model)
+        return grouped
+
     def get_models_by_tier(self, tier: str) -> List[ModelConfig]:
         """
         Get models by tier classification
@@ -437,7 +451,7 @@ class ModelRegistry:
         Returns:
             List of models in the specified tier
         """
-        return [model for model in self.models.values() if model.tier == tier and model.is_available()]
+        return [model for model in self.by_tier.get(tier, []) if model.is_available()]
 
     def get_all_models(self) -> List[ModelConfig]:
         """Get all registered models (including future/deprecated)"""
@@ -494,6 +508,16 @@ class ModelAdapter:
         Returns:
             API response or None on failure
         """
+        # Malformed messages fail identically on every model, so reject them before the chain
+        if not self._validate_messages(messages):
+            logger.error("Invalid messages: expected a non-empty list of role/content dicts")
+            return None
+
+        # Fallbacks cover failing calls, not a model the registry has never heard of
+        if self.registry.get(model_name) is None:
+            logger.error(f"Model {model_name} not found in registry")
+            return None
+
         # Get fallback chain for this model
         fallback_chain = self.registry.get_fallback_chain(model_name)
 
@@ -554,6 +578,15 @@ class ModelAdapter:
         logger.error(f"All fallback models failed. Last error: {last_error}")
         return None
 
+    @staticmethod
+    def _validate_messages(messages: Any) -> bool:
+        """Check messages is a non-empty list of dicts that each carry a role and content"""
+        return (
+            isinstance(messages, list)
+            and bool(messages)
+            and all(isinstance(message, dict) and "role" in message and "content" in message for message in messages)
+        )
+
     def _is_parameter_error(self, error: Exception) -> bool:
         """
         Check if the error is a parameter-related error that can be migrated
@@ -6,13 +6,16 @@ to detect sentence fragments and merge them appropriately before display.
 """
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
 @dataclass
 class FragmentCandidate:
     """Represents a transcript fragment that may need merging."""
 
+    # No field defaults, so plain __slots__ works on every supported Python
+    __slots__ = ("fragment_score", "text", "timestamp")
+
     text: str
     timestamp: float
     fragment_score: float
@@ -92,6 +95,25 @@ class PunctuationProcessor:
         "most",
     }
 
+    # Single-word utterances that stand alone as complete responses
+    COMPLETE_RESPONSES = frozenset(
+        {
+            "yes",
+            "no",
+            "okay",
+            "ok",
+            "sure",
+            "right",
+            "exactly",
+            "correct",
+            "good",
+            "great",
+            "thanks",
+            "hello",
+            "hi",
+        }
+    )
+
     def __init__(
         self,
         merge_threshold_ms: float = 800.0,
@@ -148,48 +170,94 @@ class PunctuationProcessor:
             # Handle empty or whitespace-only final results
             return None, pending_fragments
 
-        # Clean up the text
-        text = text.strip()
+        # Work on a copy so the caller's buffer is left untouched
+        updated_fragments = pending_fragments.copy()
+        return self._process_final(text.strip(), timestamp, updated_fragments), updated_fragments
 
-        # Calculate fragment probability
-        fragment_score = self._calculate_fragment_score(text, timestamp, pending_fragments)
+    def process_transcripts(
+        self, items: Iterable[Tuple[str, bool, float]], pending_fragments: List[FragmentCandidate]
+    ) -> Tuple[List[str], List[FragmentCandidate]]:
+        """
+        Process a batch of transcript segments in order.
 
-        # Create a copy of pending fragments for modification
-        updated_fragments = pending_fragments.copy()
+        Equivalent to calling process_transcript for each item and collecting the
+        non-empty results, without the per-call overhead in the caller's loop.
+
+        Args:
+            items: Sequence of (text, is_final, timestamp) tuples
+            pending_fragments: Current list of pending fragments
+
+        Returns:
+            Tuple of (emitted_texts, updated_pending_fragments)
+        """
+        process_final = self._process_final
+        fragments = pending_fragments.copy()
+        results = []
+        append = results.append
+
+        # The buffer is copied once for the whole batch and then updated in place
+        for text, is_final, timestamp in items:
+            if not is_final:
+                if text:
+                    append(text)
+                continue
+            if not text:
+                continue
+            text = text.strip()
+            if not text:
+                continue
+            result = process_final(text, timestamp, fragments)
+            if result:
+                append(result)
+
+        return results, fragments
+
+    def _process_final(self, text: str, timestamp: float, fragments: List[FragmentCandidate]) -> Optional[str]:
+        """
+        Classify a stripped, non-empty final segment and update the buffer in place.
+
+        Args:
+            text: Stripped final transcript text
+            timestamp: Timestamp of this segment (milliseconds)
+            fragments: Fragment buffer owned by the caller; modified in place
+
+        Returns:
+            Text to display, or None if held for merging
+        """
+        # Calculate fragment probability
+        fragment_score = self._calculate_fragment_score(text, timestamp, fragments)
 
         if fragment_score >= self.fragment_threshold:
             # This is likely a fragment - add to buffer
-            fragment = FragmentCandidate(text=text, timestamp=timestamp, fragment_score=fragment_score)
-            updated_fragments.append(fragment)
+            fragments.append(FragmentCandidate(text=text, timestamp=timestamp, fragment_score=fragment_score))
 
             # Enforce buffer size limit
-            if len(updated_fragments) > self.max_pending_fragments:
+            if len(fragments) > self.max_pending_fragments:
                 # Flush oldest fragment to prevent memory buildup
-                oldest = updated_fragments.pop(0)
-                result_text = oldest.text
-                if len(updated_fragments) > 0:
+                oldest = fragments.pop(0)
+                if len(fragments) > 0:
                     # Try to merge with next fragment
-                    next_fragment = updated_fragments[0]
+                    next_fragment = fragments[0]
                     merged = self._merge_fragments([oldest, next_fragment])
                     if merged:
-                        updated_fragments[0] = FragmentCandidate(
+                        fragments[0] = FragmentCandidate(
                             text=merged, timestamp=next_fragment.timestamp, fragment_score=next_fragment.fragment_score
                         )
-                        return None, updated_fragments
-                return result_text, updated_fragments
+                        return None
+                return oldest.text
 
-            return None, updated_fragments
-        else:
-            # This is a complete sentence
-            if updated_fragments:
-                # Merge pending fragments with this complete sentence
-                all_fragments = updated_fragments + [FragmentCandidate(text, timestamp, fragment_score)]
-                merged_text = self._merge_fragments(all_fragments)
-                updated_fragments.clear()
-                return merged_text, updated_fragments
-            else:
-                # No pending fragments, return as-is
-                return text, updated_fragments
+            return None
+
+        # This is a complete sentence
+        if fragments:
+            # Merge pending fragments with this complete sentence
+            fragments.append(FragmentCandidate(text, timestamp, fragment_score))
+            merged_text = self._merge_fragments(fragments)
+            fragments.clear()
+            return merged_text
+
+        # No pending fragments, return as-is
+        return text
 
     def _calculate_fragment_score(
         self, text: str, timestamp: float, pending_fragments: List[FragmentCandidate]
@@ -241,8 +309,15 @@ class PunctuationProcessor:
         # Grammar analysis using heuristics
         scores["grammar"] = self._analyze_grammar_patterns(text)
 
-        # Calculate weighted score
-        total_score = sum(scores[category] * self.weights[category] for category in scores)
+        # Calculate weighted score; spelled out rather than summed through a generator,
+        # since this runs on every final segment
+        weights = self.weights
+        total_score = (
+            scores["length"] * weights["length"]
+            + scores["timing"] * weights["timing"]
+            + scores["capitalization"] * weights["capitalization"]
+            + scores["grammar"] * weights["grammar"]
+        )
 
         return min(total_score, 1.0)
 
@@ -282,24 +357,8 @@ class PunctuationProcessor:
             return 0.5
 
         # Single word fragments (except complete responses)
-        if len(words) == 1:
-            complete_responses = {
-                "yes",
-                "no",
-                "okay",
-                "ok",
-                "sure",
-                "right",
-                "exactly",
-                "correct",
-                "good",
-                "great",
-                "thanks",
-                "hello",
-                "hi",
-            }
-            if first_word not in complete_responses:
-                return 0.4
+        if len(words) == 1 and first_word not in self.COMPLETE_RESPONSES:
+            return 0.4
 
         return 0.0
 
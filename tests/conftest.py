@@ -0,0 +1,11 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from model_config import model_registry
+
+
+@pytest.fixture(scope="session")
+def registry():
+    """Process-wide model registry, shared read-only by every test."""
+    return model_registry
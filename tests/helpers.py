@@ -0,0 +1,31 @@
+"""Transcript-stream and API-response helpers shared by the test modules."""
+
+from types import SimpleNamespace
+
+
+def mk_response(text, prompt_tokens=100, completion_tokens=50):
+    """Build a chat-completion-shaped response stub with token usage."""
+    usage = SimpleNamespace(
+        prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=prompt_tokens + completion_tokens
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))], usage=usage)
+
+
+def final_items(inputs):
+    """Turn (text, timestamp) pairs into final (text, is_final, timestamp) transcript items."""
+    return ((text, True, timestamp) for text, timestamp in inputs)
+
+
+def run_stream(processor, items):
+    """Feed (text, is_final, timestamp) items through the processor and flush what remains.
+
+    Returns the emitted texts, ending with the flushed remainder if there was one.
+    """
+    results, fragments = processor.process_transcripts(items, [])
+
+    # Flush remaining
+    final_result, _ = processor.flush_pending_fragments(fragments)
+    if final_result:
+        results.append(final_result)
+
+    return results
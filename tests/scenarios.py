@@ -0,0 +1,80 @@
+"""Transcript scenario tables shared by the integration and performance tests."""
+
+# (name, final (text, timestamp) inputs, substrings expected in the output, max periods or None)
+PIPELINE_SCENARIOS = [
+    (
+        "fragmented",
+        [("Hello", 1000), ("world", 1200), ("today", 1400), ("is", 1600), ("great", 1800)],
+        ["Hello", "world", "great"],
+        2,
+    ),
+    (
+        "mixed_fragment_and_complete",
+        [
+            ("Good morning everyone", 1000),
+            ("let's", 1200),
+            ("begin", 1400),
+            ("the meeting", 1600),
+            ("I have three items on the agenda today", 2500),
+        ],
+        ["I have three items on the agenda today", "Good morning everyone"],
+        None,
+    ),
+    (
+        "punctuation_preservation",
+        [
+            ("How are you?", 1000),
+            ("I'm doing great!", 1200),
+            ("What about you", 1400),  # Missing punctuation
+        ],
+        ["?", "!"],
+        None,
+    ),
+    (
+        "abbreviations",
+        [
+            ("I spoke with Dr.", 1000),
+            ("Smith", 1100),
+            ("about the project", 1200),
+            ("The meeting is at 3:30 p.m.", 2000),
+            ("on Jan.", 2100),
+            ("15th", 2200),
+        ],
+        ["Dr.", "p.m.", "Jan."],
+        None,
+    ),
+    (
+        "urls_and_emails",
+        [
+            ("Visit https://example.com", 1000),
+            ("for more information", 1100),
+            ("Send emails to user@example.com", 2000),
+            ("with your questions", 2100),
+        ],
+        ["https://example.com", "user@example.com"],
+        None,
+    ),
+    (
+        "numbers_and_decimals",
+        [("The value is 3.14", 1000), ("and the price is $29.99", 1100), ("We need 1,000 units", 2000)],
+        ["3.14", "29.99", "1,000"],
+        None,
+    ),
+    (
+        "quotes_and_parentheses",
+        [
+            ('He said "Hello', 1000),
+            ('world" to everyone', 1100),
+            ("The document (version 2)", 2000),
+            ("is ready", 2100),
+        ],
+        ['"', "(", ")"],
+        None,
+    ),
+    (
+        "empty_and_whitespace",
+        [("", 1000), ("   ", 1100), ("Hello", 1200), ("", 1300), ("world", 1400), ("\t\n", 1500)],
+        ["Hello", "world"],
+        None,
+    ),
+]
@@ -8,11 +8,12 @@ timing patterns, and edge cases for thorough testing of punctuation processing.
 
 import json
 import random
+import sys
 from dataclasses import asdict, dataclass
 from typing import Dict, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(frozen=True, **({"slots": True} if sys.version_info >= (3, 10) else {}))
 class TranscriptEvent:
     """Represents a single transcript event from Deepgram"""
 
@@ -1,10 +1,7 @@
-import os
 import sys
 import types
 from unittest.mock import MagicMock
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 deepgram_stub = types.SimpleNamespace(
     DeepgramClient=MagicMock,
     LiveOptions=MagicMock,
@@ -5,15 +5,25 @@ These tests capture the current behavior of complex functions before refactoring
 They ensure that refactoring doesn't break existing functionality.
 """
 
-import os
-import sys
 import unittest
 from unittest.mock import patch
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from helpers import mk_response
 
-from enhance import FragmentProcessor, enhance_prompt
+import enhance
+from enhance import enhance_prompt, fragment_processor
+from model_config import ModelConfig, ModelRegistry
+
+# Default success response
+_DEFAULT_OK = mk_response("Enhanced: hello world")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_usage_stats():
+    """Give each test its own adapter usage stats so results don't depend on test order."""
+    with patch.object(enhance.model_adapter, "usage_stats", {}):
+        yield
 
 
 class TestEnhancePromptCharacterization(unittest.TestCase):
@@ -27,10 +37,10 @@ class TestEnhancePromptCharacterization(unittest.TestCase):
         )
         self.fragmented_transcript = "send email. subject quarterly. report body. attached documents"
 
-    @patch("enhance.call_with_fallback")
+    @patch.object(enhance.model_adapter, "call_with_fallback")
     def test_simple_enhance_balanced(self, mock_call):
         """Test basic enhancement with balanced style"""
-        mock_call.return_value = ("Enhanced: hello world", None)
+        mock_call.return_value = _DEFAULT_OK
 
         result, error = enhance_prompt(self.simple_transcript, style="balanced")
 
@@ -38,10 +48,10 @@ class TestEnhancePromptCharacterization(unittest.TestCase):
         self.assertIsNone(error)
         mock_call.assert_called_once()
 
-    @patch("enhance.call_with_fallback")
+    @patch.object(enhance.model_adapter, "call_with_fallback")
     def test_enhance_with_fragments(self, mock_call):
         """Test enhancement with fragment processing"""
-        mock_call.return_value = ("Enhanced with fragments", None)
+        mock_call.return_value = _DEFAULT_OK
 
         result, error = enhance_prompt(
             self.fragmented_transcript, style="balanced", fragment_processing_config={"enabled": True}
@@ -64,7 +74,7 @@ class TestEnhancePromptCharacterization(unittest.TestCase):
         self.assertIsNone(result)
         self.assertEqual(error, "Empty transcript")
 
-    @patch("enhance.estimate_tokens_with_fragments")
+    @patch.object(enhance, "estimate_tokens_with_fragments")
     def test_transcript_too_long(self, mock_estimate):
         """Test handling of transcript that exceeds token limit"""
         mock_estimate.return_value = 3001  # Just over the limit
@@ -74,10 +84,10 @@ class TestEnhancePromptCharacterization(unittest.TestCase):
         self.assertIsNone(result)
         self.assertEqual(error, "Transcript too long for enhancement")
 
-    @patch("enhance.call_with_fallback")
+    @patch.object(enhance.model_adapter, "call_with_fallback")
     def test_different_styles(self, mock_call):
         """Test enhancement with different styles"""
-        mock_call.return_value = ("Enhanced", None)
+        mock_call.return_value = _DEFAULT_OK
 
         for style in ["concise", "balanced", "detailed"]:
             with self.subTest(style=style):
@@ -85,34 +95,49 @@ class TestEnhancePromptCharacterization(unittest.TestCase):
                 self.assertIsNotNone(result)
                 self.assertIsNone(error)
 
-    @patch("enhance.call_with_fallback")
+    @patch.object(enhance.model_adapter, "call_with_fallback")
     def test_invalid_style_fallback(self, mock_call):
         """Test that invalid style falls back to balanced"""
-        mock_call.return_value = ("Enhanced", None)
+        mock_call.return_value = _DEFAULT_OK
 
         result, error = enhance_prompt(self.simple_transcript, style="invalid_style")
 
         self.assertIsNotNone(result)
         self.assertIsNone(error)
 
+    @patch.object(enhance.model_adapter, "call_with_fallback")
+    def test_style_to_verbosity_mapping(self, mock_call):
+        """Test that each style sends its verbosity level to models that support it"""
+        mock_call.return_value = _DEFAULT_OK
+
+        # GPT-4.1 and GPT-5 never get verbosity, so register a model outside both families
+        registry = ModelRegistry()
+        registry.register(ModelConfig("future-model", "Future Model", "max_tokens", 1000, supports_verbosity=True))
+
+        with patch.object(enhance, "model_registry", registry):
+            for style, verbosity in (("concise", "low"), ("balanced", "medium"), ("detailed", "high")):
+                with self.subTest(style=style):
+                    _, error = enhance_prompt(self.simple_transcript, style=style, model_key="future-model")
+
+                    self.assertIsNone(error)
+                    self.assertEqual(mock_call.call_args.kwargs["verbosity"], verbosity)
+
 
 class TestReconstructFragmentsCharacterization(unittest.TestCase):
     """Characterization tests for reconstruct_fragments function (complexity: 37, length: 90 lines)"""
 
     def test_simple_sentence(self):
         """Test reconstruction of a simple complete sentence"""
-        processor = FragmentProcessor()
         text = "This is a complete sentence."
-        result = processor.reconstruct_fragments(text)
+        result = fragment_processor.reconstruct_fragments(text)
 
         # Should remain unchanged
         self.assertEqual(result, text)
 
     def test_fragmented_text(self):
         """Test reconstruction of fragmented text"""
-        processor = FragmentProcessor()
         text = "send email. subject quarterly. report attached."
-        result = processor.reconstruct_fragments(text)
+        result = fragment_processor.reconstruct_fragments(text)
 
         # Should be reconstructed (exact output depends on logic)
         self.assertIsNotNone(result)
@@ -120,24 +145,21 @@ class TestReconstructFragmentsCharacterization(unittest.TestCase):
 
     def test_mixed_fragments_and_complete(self):
         """Test mix of fragments and complete sentences"""
-        processor = FragmentProcessor()
         text = "I need to send an email. subject line. Please review the attached document."
-        result = processor.reconstruct_fragments(text)
+        result = fragment_processor.reconstruct_fragments(text)
 
         self.assertIsNotNone(result)
         self.assertIn("email", result.lower())
 
     def test_empty_text(self):
         """Test handling of empty text"""
-        processor = FragmentProcessor()
-        result = processor.reconstruct_fragments("")
+        result = fragment_processor.reconstruct_fragments("")
 
         self.assertEqual(result, "")
 
     def test_single_word(self):
         """Test handling of single word"""
-        processor = FragmentProcessor()
-        result = processor.reconstruct_fragments("hello")
+        result = fragment_processor.reconstruct_fragments("hello")
 
         self.assertEqual(result, "hello")
 
@@ -147,34 +169,30 @@ class TestIsValidStandaloneCharacterization(unittest.TestCase):
 
     def test_complete_sentence(self):
         """Test validation of complete sentence"""
-        processor = FragmentProcessor()
         text = "This is a complete sentence with a subject and verb."
-        result = processor._is_valid_standalone(text)
+        result = fragment_processor._is_valid_standalone(text)
 
         self.assertTrue(result)
 
     def test_fragment_no_verb(self):
         """Test fragment without verb"""
-        processor = FragmentProcessor()
         text = "quarterly report"
-        result = processor._is_valid_standalone(text)
+        result = fragment_processor._is_valid_standalone(text)
 
         self.assertFalse(result)
 
     def test_very_short_text(self):
         """Test very short text"""
-        processor = FragmentProcessor()
         text = "ok"
-        result = processor._is_valid_standalone(text)
+        result = fragment_processor._is_valid_standalone(text)
 
         # Very short texts are typically not valid standalone
         self.assertFalse(result)
 
     def test_question(self):
         """Test question as valid standalone"""
-        processor = FragmentProcessor()
         text = "What is the status of the project?"
-        result = processor._is_valid_standalone(text)
+        result = fragment_processor._is_valid_standalone(text)
 
         self.assertTrue(result)
 
@@ -184,77 +202,70 @@ class TestShouldMergeWithNextCharacterization(unittest.TestCase):
 
     def test_continuation_phrase(self):
         """Test merging with continuation phrases"""
-        processor = FragmentProcessor()
         current = "The report includes"
         next_text = "quarterly financial data and projections"
 
-        result = processor._should_merge_with_next(current, next_text)
+        result = fragment_processor._should_merge_with_next(current, next_text)
         self.assertTrue(result)
 
     def test_complete_sentences_no_merge(self):
         """Test that complete sentences don't merge unnecessarily"""
-        processor = FragmentProcessor()
         current = "The report is complete."
         next_text = "Please review it carefully."
 
-        result = processor._should_merge_with_next(current, next_text)
+        result = fragment_processor._should_merge_with_next(current, next_text)
         self.assertFalse(result)
 
     def test_incomplete_thought(self):
         """Test merging of incomplete thoughts"""
-        processor = FragmentProcessor()
         current = "Send email to"
         next_text = "john@example.com"
 
-        result = processor._should_merge_with_next(current, next_text)
+        result = fragment_processor._should_merge_with_next(current, next_text)
         self.assertTrue(result)
 
     def test_none_inputs(self):
         """Test handling of None inputs"""
-        processor = FragmentProcessor()
-
         # Test with None current
-        result = processor._should_merge_with_next(None, "some text")
+        result = fragment_processor._should_merge_with_next(None, "some text")
         self.assertFalse(result)
 
         # Test with None next
-        result = processor._should_merge_with_next("some text", None)
+        result = fragment_processor._should_merge_with_next("some text", None)
         self.assertFalse(result)
 
         # Test with both None
-        result = processor._should_merge_with_next(None, None)
+        result = fragment_processor._should_merge_with_next(None, None)
         self.assertFalse(result)
 
     def test_empty_strings(self):
         """Test handling of empty strings"""
-        processor = FragmentProcessor()
-
-        result = processor._should_merge_with_next("", "text")
+        result = fragment_processor._should_merge_with_next("", "text")
         self.assertFalse(result)
 
-        result = processor._should_merge_with_next("text", "")
+        result = fragment_processor._should_merge_with_next("text", "")
         self.assertFalse(result)
 
 
 class TestEdgeCasesCharacterization(unittest.TestCase):
     """Test edge cases and error conditions"""
 
-    @patch("enhance.call_with_fallback")
+    @patch.object(enhance.model_adapter, "call_with_fallback")
     def test_api_failure_handling(self, mock_call):
         """Test handling of API failures"""
-        mock_call.return_value = (None, "API Error: Rate limit exceeded")
+        # The adapter swallows API errors after exhausting its fallback chain
+        mock_call.return_value = None
 
         result, error = enhance_prompt("test transcript", style="balanced")
 
         self.assertIsNone(result)
         self.assertIsNotNone(error)
-        self.assertIn("API Error", error)
+        self.assertIn("Enhancement failed", error)
 
     def test_unicode_handling(self):
         """Test handling of unicode characters"""
-        processor = FragmentProcessor()
         text = "Send café résumé to naïve coördinator"
-        result = processor.reconstruct_fragments(text)
+        result = fragment_processor.reconstruct_fragments(text)
 
         self.assertIsNotNone(result)
         # Should preserve unicode characters
@@ -262,8 +273,6 @@ class TestEdgeCasesCharacterization(unittest.TestCase):
 
     def test_punctuation_edge_cases(self):
         """Test various punctuation scenarios"""
-        processor = FragmentProcessor()
-
         test_cases = [
             "Multiple... ellipsis... in text...",
             "Mix of punctuation!? Really?!",
@@ -274,9 +283,5 @@ class TestEdgeCasesCharacterization(unittest.TestCase):
 
         for text in test_cases:
             with self.subTest(text=text):
-                result = processor.reconstruct_fragments(text)
+                result = fragment_processor.reconstruct_fragments(text)
                 self.assertIsNotNone(result)
-
-
-if __name__ == "__main__":
-    unittest.main()
@@ -4,13 +4,8 @@ Unit tests for FragmentProcessor class
 Tests fragment detection and reconstruction logic
 """
 
-import os
-import sys
 import unittest
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from enhance import FragmentProcessor
 
 
@@ -205,7 +200,3 @@ class TestFragmentProcessor(unittest.TestCase):
         # The logic correctly identifies that two 2-word sentences could be fragments
         self.assertTrue(self.processor._should_merge_with_next("Complete sentence.", "Another sentence."))
         self.assertFalse(self.processor._should_merge_with_next("", "Next"))
-
-
-if __name__ == "__main__":
-    unittest.main()
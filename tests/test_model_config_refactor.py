@@ -5,15 +5,87 @@ These tests capture the current behavior of complex functions before refactoring
 They ensure that refactoring doesn't break existing functionality.
 """
 
-import os
-import sys
 import unittest
-from unittest.mock import MagicMock, patch
-
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from model_config import ModelRegistry
+from types import SimpleNamespace
+from unittest.mock import Mock, NonCallableMock
+
+import pytest
+from helpers import mk_response
+
+from model_config import ModelAdapter, ModelConfig, ModelRegistry, get_model_usage_summary
+
+_MESSAGES = [{"role": "user", "content": "Test"}]
+_MALFORMED_MESSAGES = (
+    None,
+    [],
+    "string instead of list",
+    [{"invalid": "structure"}],
+    [{"role": "user"}],  # Missing content
+    [{"content": "test"}],  # Missing role
+)
+
+# Client for adapter tests that never reach the API
+_SHARED_CLIENT = NonCallableMock(spec_set=["chat"])
+
+# API errors the adapter should (and should not) treat as migratable parameter errors
+_PARAM_ERRORS = tuple(
+    Exception(message)
+    for message in (
+        "Invalid parameter: max_tokens",
+        "Unrecognized parameter: reasoning_effort",
+        "Expected max_completion_tokens",
+        "Unsupported parameter: verbosity",
+    )
+)
+_NON_PARAM_ERRORS = (Exception("Network connection failed"), Exception("Rate limit exceeded"))
+
+# Simulated API failures for the fallback tests; raising an instance again is harmless
+_PRIMARY_FAILED = Exception("Primary model failed")
+_ALL_FAILED = Exception("All models failed")
+_TRANSIENT = Exception("Transient error")
+
+
+# Default success response
+_OPENAI_OK = mk_response("Response text")
+_EMPTY_OPENAI_RESP = SimpleNamespace(choices=[])
+
+_FULL_KWARGS = {"max_tokens": 1000, "temperature": 0.3, "reasoning_effort": "low", "verbosity": "medium"}
+
+# (build_api_params kwargs, expected output subset, keys that must be absent) per parameter generation
+GPT5_PARAM_CASES = [
+    (
+        _FULL_KWARGS,
+        {
+            "model": "gpt-5-nano",
+            "max_completion_tokens": 1000,
+            "temperature": 1.0,
+            "reasoning_effort": "low",
+            "verbosity": "medium",
+        },
+        {"max_tokens"},
+    ),
+    (
+        {"max_tokens": 500, "response_format": "json"},
+        {"max_completion_tokens": 500, "response_format": {"type": "json_object"}, "reasoning_effort": "low"},
+        {"max_tokens", "verbosity"},
+    ),
+]
+GPT4_PARAM_CASES = [
+    (
+        _FULL_KWARGS,
+        {"model": "gpt-4o-mini", "max_tokens": 1000, "temperature": 0.3},
+        {"max_completion_tokens", "reasoning_effort", "verbosity"},
+    ),
+    ({"temperature": 5.0}, {"max_tokens": 150, "temperature": 2.0}, {"max_completion_tokens"}),
+]
+
+
+class _SessionRegistryMixin:
+    """Binds the conftest session registry to self.registry for unittest-style tests"""
+
+    @pytest.fixture(autouse=True)
+    def _bind_registry(self, registry):
+        self.registry = registry
 
 
 class TestInitializeDefaultModelsCharacterization(unittest.TestCase):
@@ -25,310 +97,286 @@ class TestInitializeDefaultModelsCharacterization(unittest.TestCase):
 
     def test_default_models_initialization(self):
         """Test that default models are properly initialized"""
-        # Call the initialization
-        self.registry._initialize_default_models()
-
-        # Check that models are registered
+        # The constructor registers the defaults
         self.assertGreater(len(self.registry.models), 0)
 
         # Check for specific model tiers
-        tiers = self.registry.get_models_by_tier()
-        self.assertIn("Economy", tiers)
-        self.assertIn("Standard", tiers)
-        self.assertIn("Flagship", tiers)
-
-    def test_economy_tier_models(self):
-        """Test economy tier model registration"""
-        self.registry._initialize_default_models()
-
-        economy_models = self.registry.get_models_by_tier()["Economy"]
-
-        # Check that economy models exist
-        self.assertIsInstance(economy_models, list)
-        self.assertGreater(len(economy_models), 0)
-
-        # Check model properties
-        for model_key in economy_models:
-            model = self.registry.get_model(model_key)
-            self.assertIsNotNone(model)
-            self.assertEqual(model.tier, "Economy")
-            self.assertIsNotNone(model.context_window)
-            self.assertIsNotNone(model.max_output)
-
-    def test_standard_tier_models(self):
-        """Test standard tier model registration"""
-        self.registry._initialize_default_models()
-
-        standard_models = self.registry.get_models_by_tier()["Standard"]
+        self.assertGreaterEqual(self.registry.by_tier.keys(), {"economy", "standard", "flagship"})
 
-        # Check that standard models exist
-        self.assertIsInstance(standard_models, list)
-        self.assertGreater(len(standard_models), 0)
+    def test_tier_models(self):
+        """Test economy, standard and flagship tier model registration"""
+        for tier in ("economy", "standard", "flagship"):
+            with self.subTest(tier=tier):
+                tier_models = self.registry.get_models_by_tier(tier)
 
-        # Check model properties
-        for model_key in standard_models:
-            model = self.registry.get_model(model_key)
-            self.assertIsNotNone(model)
-            self.assertEqual(model.tier, "Standard")
+                # Check that tier models exist
+                self.assertIsInstance(tier_models, list)
+                self.assertGreater(len(tier_models), 0)
 
-    def test_flagship_tier_models(self):
-        """Test flagship tier model registration"""
-        self.registry._initialize_default_models()
+                # Every listed model is registered under this tier
+                self.assertEqual({model.tier for model in tier_models}, {tier})
+                for model in tier_models:
+                    self.assertIs(self.registry.get(model.model_name), model)
 
-        flagship_models = self.registry.get_models_by_tier()["Flagship"]
-
-        # Check that flagship models exist
-        self.assertIsInstance(flagship_models, list)
-        self.assertGreater(len(flagship_models), 0)
-
-        # Check model properties
-        for model_key in flagship_models:
-            model = self.registry.get_model(model_key)
-            self.assertIsNotNone(model)
-            self.assertEqual(model.tier, "Flagship")
+        # Check economy model properties
+        for model in self.registry.get_models_by_tier("economy"):
+            self.assertIsNotNone(model.context_window)
+            self.assertIsNotNone(model.output_token_limit)
 
     def test_model_fallback_chains(self):
         """Test that models have proper fallback chains"""
-        self.registry._initialize_default_models()
+        # GPT-4o-mini is the ultimate fallback, so its chain is just itself
+        self.assertEqual(self.registry.get_fallback_chain("gpt-4o-mini"), ["gpt-4o-mini"])
 
-        # Get a model with fallbacks
-        model = self.registry.get_model("gpt-4o-mini")
-        if model and model.fallback_models:
-            # Check fallback chain
-            for fallback_key in model.fallback_models:
-                fallback_model = self.registry.get_model(fallback_key)
-                self.assertIsNotNone(fallback_model)
+        for model_key in self.registry.models:
+            with self.subTest(model=model_key):
+                chain = self.registry.get_fallback_chain(model_key)
 
-    def test_provider_distribution(self):
-        """Test that multiple providers are represented"""
-        self.registry._initialize_default_models()
+                # Each chain starts with the requested model and ends at the ultimate fallback
+                self.assertEqual(chain[0], model_key)
+                self.assertEqual(chain[-1], "gpt-4o-mini")
 
-        providers = set()
-        for model_key, model in self.registry.models.items():
-            providers.add(model.provider)
-
-        # Should have multiple providers
-        self.assertGreater(len(providers), 1)
-
-        # Check for specific providers
-        expected_providers = {"openai", "anthropic"}
-        self.assertTrue(providers & expected_providers)
+                # Every fallback must resolve to a registered model
+                missing = set(chain) - self.registry.models.keys()
+                self.assertFalse(missing, f"Missing fallbacks: {missing}")
 
 
 class TestCallWithFallbackCharacterization(unittest.TestCase):
-    """Characterization tests for call_with_fallback (complexity: 14, length: 71 lines)"""
+    """Characterization tests for ModelAdapter.call_with_fallback (complexity: 14, length: 71 lines)"""
 
     def setUp(self):
         """Set up test fixtures"""
-        self.registry = ModelRegistry()
-        self.registry._initialize_default_models()
+        self.client = Mock(spec=["chat"])
+        self.create = self.client.chat.completions.create
+        self.adapter = ModelAdapter(self.client)
 
-    @patch("model_config.openai")
-    def test_successful_call_no_fallback(self, mock_openai):
+    def _attempted_models(self):
+        """Models the adapter sent requests for, in call order"""
+        return [call.kwargs["model"] for call in self.create.call_args_list]
+
+    def test_successful_call_no_fallback(self):
         """Test successful API call without needing fallback"""
-        mock_client = MagicMock()
-        mock_openai.OpenAI.return_value = mock_client
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Response text"))]
-        mock_client.chat.completions.create.return_value = mock_response
+        self.create.return_value = _OPENAI_OK
 
-        result, error = self.registry.call_with_fallback(model_key="gpt-4o-mini", messages=[{"role": "user", "content": "Test"}])
+        response = self.adapter.call_with_fallback("gpt-4o-mini", _MESSAGES)
 
-        self.assertEqual(result, "Response text")
-        self.assertIsNone(error)
+        self.assertIs(response, _OPENAI_OK)
+        self.assertEqual(self._attempted_models(), ["gpt-4o-mini"])
 
-    @patch("model_config.openai")
-    def test_fallback_on_primary_failure(self, mock_openai):
+    def test_fallback_on_primary_failure(self):
         """Test fallback to secondary model on primary failure"""
-        mock_client = MagicMock()
-        mock_openai.OpenAI.return_value = mock_client
+        fallback_response = mk_response("Fallback response")
 
         # First call fails
-        mock_client.chat.completions.create.side_effect = [
-            Exception("Primary model failed"),
-            MagicMock(choices=[MagicMock(message=MagicMock(content="Fallback response"))]),
-        ]
+        self.create.side_effect = (_PRIMARY_FAILED, fallback_response)
 
-        result, error = self.registry.call_with_fallback(model_key="gpt-4o-mini", messages=[{"role": "user", "content": "Test"}])
+        response = self.adapter.call_with_fallback("gpt-5-nano", _MESSAGES)
 
-        # Should get fallback response
-        self.assertIsNotNone(result)
-        self.assertIsNone(error)
+        # Should get fallback response from the next model in the chain
+        self.assertIs(response, fallback_response)
+        self.assertEqual(self._attempted_models(), ["gpt-5-nano", "gpt-4.1-nano"])
 
-    @patch("model_config.openai")
-    def test_all_models_fail(self, mock_openai):
+    def test_all_models_fail(self):
         """Test when all models in fallback chain fail"""
-        mock_client = MagicMock()
-        mock_openai.OpenAI.return_value = mock_client
-        mock_client.chat.completions.create.side_effect = Exception("All models failed")
+        self.create.side_effect = _ALL_FAILED
 
-        result, error = self.registry.call_with_fallback(model_key="gpt-4o-mini", messages=[{"role": "user", "content": "Test"}])
+        response = self.adapter.call_with_fallback("gpt-5-nano", _MESSAGES)
 
-        self.assertIsNone(result)
-        self.assertIsNotNone(error)
-        self.assertIn("failed", error.lower())
+        self.assertIsNone(response)
+        self.assertEqual(self._attempted_models(), self.adapter.registry.get_fallback_chain("gpt-5-nano"))
 
     def test_invalid_model_key(self):
         """Test handling of invalid model key"""
-        result, error = self.registry.call_with_fallback(
-            model_key="invalid-model-key", messages=[{"role": "user", "content": "Test"}]
-        )
+        with self.assertLogs("model_config", level="ERROR") as logs:
+            response = self.adapter.call_with_fallback("invalid-model-key", _MESSAGES)
 
-        self.assertIsNone(result)
-        self.assertIsNotNone(error)
-        self.assertIn("not found", error.lower())
+        self.assertIsNone(response)
+        self.assertIn("not found", logs.output[0])
+        self.create.assert_not_called()
 
     def test_empty_messages(self):
         """Test handling of empty messages"""
-        result, error = self.registry.call_with_fallback(model_key="gpt-4o-mini", messages=[])
-
-        # Should handle gracefully
-        self.assertIsNone(result)
-        self.assertIsNotNone(error)
+        response = self.adapter.call_with_fallback("gpt-4o-mini", [])
 
-    @patch("model_config.anthropic")
-    def test_anthropic_model_call(self, mock_anthropic):
-        """Test calling Anthropic models"""
-        mock_client = MagicMock()
-        mock_anthropic.Anthropic.return_value = mock_client
-        mock_response = MagicMock()
-        mock_response.content = [MagicMock(text="Anthropic response")]
-        mock_client.messages.create.return_value = mock_response
+        # Should be rejected before any request is made
+        self.assertIsNone(response)
+        self.create.assert_not_called()
 
-        result, error = self.registry.call_with_fallback(model_key="claude-3-haiku", messages=[{"role": "user", "content": "Test"}])
-
-        self.assertEqual(result, "Anthropic response")
-        self.assertIsNone(error)
-
-    @patch("model_config.openai")
-    def test_retry_logic(self, mock_openai):
-        """Test retry logic on transient failures"""
-        mock_client = MagicMock()
-        mock_openai.OpenAI.return_value = mock_client
+    def test_retry_logic(self):
+        """Test each transient failure moves on to the next model in the chain"""
+        success = mk_response("Success after retry")
 
         # First two attempts fail, third succeeds
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Success after retry"))]
-        mock_client.chat.completions.create.side_effect = [
-            Exception("Transient error 1"),
-            Exception("Transient error 2"),
-            mock_response,
-        ]
-
-        result, error = self.registry.call_with_fallback(
-            model_key="gpt-4o-mini", messages=[{"role": "user", "content": "Test"}], max_retries=3
-        )
+        self.create.side_effect = (_TRANSIENT, _TRANSIENT, success)
 
-        # Should eventually succeed
-        self.assertIsNotNone(result)
-        self.assertIsNone(error)
+        response = self.adapter.call_with_fallback("gpt-5-nano", _MESSAGES)
 
+        # Should eventually succeed on the ultimate fallback
+        self.assertIs(response, success)
+        self.assertEqual(self._attempted_models(), ["gpt-5-nano", "gpt-4.1-nano", "gpt-4o-mini"])
 
-class TestModelRegistryCharacterization(unittest.TestCase):
-    """Test ModelRegistry class methods"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.registry = ModelRegistry()
-        self.registry._initialize_default_models()
+class TestModelRegistryCharacterization(_SessionRegistryMixin, unittest.TestCase):
+    """Test ModelRegistry class methods"""
 
     def test_get_default_model(self):
         """Test getting the default model"""
         default = self.registry.get_default_model()
 
-        self.assertIsNotNone(default)
-        self.assertIn(default, self.registry.models)
+        self.assertIsInstance(default, ModelConfig)
+        self.assertIs(self.registry.get(default.model_name), default)
 
     def test_get_models_by_tier_structure(self):
         """Test structure of get_models_by_tier return value"""
-        tiers = self.registry.get_models_by_tier()
+        tiers = self.registry.by_tier
 
         self.assertIsInstance(tiers, dict)
-        for tier_name, models in tiers.items():
+        for tier_name in tiers:
+            models = self.registry.get_models_by_tier(tier_name)
             self.assertIsInstance(tier_name, str)
             self.assertIsInstance(models, list)
-            for model_key in models:
-                self.assertIsInstance(model_key, str)
-                self.assertIn(model_key, self.registry.models)
+            for model in models:
+                self.assertIsInstance(model, ModelConfig)
+                self.assertIn(model.model_name, self.registry.models)
+
+    def test_by_tier_grouping(self):
+        """Test by_tier groups every registered model and refreshes on register"""
+        # Registers a model, so use a private registry rather than the shared one
+        registry = ModelRegistry()
+        economy = {model.model_name for model in registry.by_tier["economy"]}
+        self.assertIn("gpt-5-nano", economy)
+        self.assertEqual(
+            sum(len(models) for models in registry.by_tier.values()),
+            len(registry.models),
+        )
 
-    def test_model_migration(self):
-        """Test model migration functionality"""
-        # Test migration from old to new model names
-        old_model = "gpt-4"
-        result = self.registry.migrate_model(old_model)
+        registry.register(ModelConfig("test-model", "Test Model", "max_tokens", 100, tier="economy"))
+        economy = {model.model_name for model in registry.by_tier["economy"]}
+        self.assertIn("test-model", economy)
 
-        # Should return a valid model key
-        self.assertIsNotNone(result)
-        if result != old_model:
-            self.assertIn(result, self.registry.models)
+    def test_model_migration(self):
+        """Test parameter migration between token parameter names"""
+        gpt5 = self.registry.get("gpt-5-nano")
+        gpt4 = self.registry.get("gpt-4o-mini")
+
+        # Old-style max_tokens becomes max_completion_tokens for GPT-5, and back for GPT-4
+        self.assertEqual(gpt5.migrate_params({"max_tokens": 100}), {"max_completion_tokens": 100})
+        self.assertEqual(
+            gpt4.migrate_params({"max_completion_tokens": 100, "temperature": 5.0}),
+            {"max_tokens": 100, "temperature": 2.0},
+        )
 
     def test_usage_statistics_tracking(self):
         """Test usage statistics are properly tracked"""
-        stats = self.registry.get_usage_statistics()
+        stats = get_model_usage_summary()
 
         self.assertIsInstance(stats, dict)
         # Check for expected keys
-        expected_keys = ["total_calls", "total_tokens", "total_cost"]
-        for key in expected_keys:
-            self.assertIn(key, stats)
+        self.assertLessEqual({"total_calls", "total_cost", "by_tier"}, stats.keys())
 
     def test_cost_estimation(self):
         """Test cost estimation for models"""
-        model_key = "gpt-4o-mini"
-        estimated_cost = self.registry.estimate_cost(model_key=model_key, input_tokens=100, output_tokens=50)
+        model = self.registry.get("gpt-4o-mini")
+        estimated_cost = model.estimate_cost(input_tokens=100, output_tokens=50)
 
         self.assertIsInstance(estimated_cost, (int, float))
         self.assertGreaterEqual(estimated_cost, 0)
 
 
+class TestBuildApiParamsCharacterization(_SessionRegistryMixin, unittest.TestCase):
+    """Characterization tests for ModelConfig.build_api_params"""
+
+    def _check_cases(self, config, cases):
+        """Build params for each case and compare against its expected subset and absent keys"""
+        for kwargs, expected, absent in cases:
+            with self.subTest(kwargs=kwargs):
+                params = config.build_api_params(_MESSAGES, **kwargs)
+
+                self.assertLessEqual(expected.items(), params.items())
+                self.assertTrue(params.keys().isdisjoint(absent))
+
+    def test_build_api_params_gpt5(self):
+        """Test GPT-5 uses max_completion_tokens and keeps reasoning/verbosity"""
+        self._check_cases(self.registry.get("gpt-5-nano"), GPT5_PARAM_CASES)
+
+    def test_build_api_params_gpt4(self):
+        """Test GPT-4o-mini uses max_tokens, clamps temperature and drops unsupported parameters"""
+        self._check_cases(self.registry.get("gpt-4o-mini"), GPT4_PARAM_CASES)
+
+
+class TestModelAdapterCharacterization(_SessionRegistryMixin, unittest.TestCase):
+    """Characterization tests for ModelAdapter bookkeeping that doesn't call the API"""
+
+    def setUp(self):
+        """Set up test fixtures; usage stats are per adapter, so each test gets its own"""
+        self.adapter = ModelAdapter(_SHARED_CLIENT)
+
+    def test_adapter_initialization(self):
+        """Test adapter wires the client and global registry with empty stats"""
+        self.assertIs(self.adapter.client, _SHARED_CLIENT)
+        self.assertIs(self.adapter.registry, self.registry)
+        self.assertEqual(self.adapter.get_usage_stats(), {})
+
+    def test_usage_stats_tracking(self):
+        """Test usage stats accumulate per model"""
+        config = self.registry.get("gpt-5-nano")
+        mock_usage = SimpleNamespace(prompt_tokens=100, completion_tokens=50, total_tokens=150)
+
+        self.adapter._update_usage_stats(config, mock_usage)
+        self.adapter._update_usage_stats(config, mock_usage)
+
+        stats = self.adapter.get_usage_stats()["gpt-5-nano"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["total_input_tokens"], 200)
+        self.assertEqual(stats["total_output_tokens"], 100)
+        self.assertEqual(stats["tier"], config.tier)
+        self.assertAlmostEqual(stats["total_cost"], 2 * config.estimate_cost(100, 50))
+
+    def test_malformed_messages_skip_api(self):
+        """Test malformed messages are rejected before any model in the chain is called"""
+        client = Mock()
+        adapter = ModelAdapter(client)
+
+        for messages in _MALFORMED_MESSAGES:
+            with self.subTest(messages=messages):
+                self.assertFalse(ModelAdapter._validate_messages(messages))
+                self.assertIsNone(adapter.call_with_fallback("gpt-4o-mini", messages))
+
+        client.chat.completions.create.assert_not_called()
+        self.assertTrue(ModelAdapter._validate_messages(_MESSAGES))
+
+    def test_parameter_error_detection(self):
+        """Test which errors are treated as migratable parameter errors"""
+        for error in _PARAM_ERRORS:
+            with self.subTest(error=str(error)):
+                self.assertTrue(self.adapter._is_parameter_error(error))
+        for error in _NON_PARAM_ERRORS:
+            with self.subTest(error=str(error)):
+                self.assertFalse(self.adapter._is_parameter_error(error))
+
+
 class TestEdgeCasesAndErrorHandling(unittest.TestCase):
     """Test edge cases and error handling"""
 
     def setUp(self):
         """Set up test fixtures"""
-        self.registry = ModelRegistry()
-        self.registry._initialize_default_models()
+        self.client = Mock(spec=["chat"])
+        self.create = self.client.chat.completions.create
+        self.adapter = ModelAdapter(self.client)
 
     def test_none_inputs(self):
         """Test handling of None inputs"""
-        result, error = self.registry.call_with_fallback(model_key=None, messages=[{"role": "user", "content": "Test"}])
-
-        self.assertIsNone(result)
-        self.assertIsNotNone(error)
-
-    def test_malformed_messages(self):
-        """Test handling of malformed message structures"""
-        test_cases = [
-            None,
-            "string instead of list",
-            [{"invalid": "structure"}],
-            [{"role": "user"}],  # Missing content
-            [{"content": "test"}],  # Missing role
-        ]
-
-        for messages in test_cases:
-            with self.subTest(messages=messages):
-                result, error = self.registry.call_with_fallback(model_key="gpt-4o-mini", messages=messages)
-
-                self.assertIsNone(result)
-                self.assertIsNotNone(error)
-
-    @patch("model_config.openai")
-    def test_partial_response_handling(self, mock_openai):
-        """Test handling of partial or malformed API responses"""
-        mock_client = MagicMock()
-        mock_openai.OpenAI.return_value = mock_client
-
-        # Response missing expected fields
-        mock_response = MagicMock()
-        mock_response.choices = []  # Empty choices
-        mock_client.chat.completions.create.return_value = mock_response
+        with self.assertLogs("model_config", level="ERROR"):
+            response = self.adapter.call_with_fallback(None, _MESSAGES)
 
-        result, error = self.registry.call_with_fallback(model_key="gpt-4o-mini", messages=[{"role": "user", "content": "Test"}])
+        self.assertIsNone(response)
+        self.create.assert_not_called()
 
-        self.assertIsNone(result)
-        self.assertIsNotNone(error)
+    def test_partial_response_handling(self):
+        """Test partial or malformed API responses are returned to the caller unchanged"""
+        # Response missing expected fields (empty choices)
+        self.create.return_value = _EMPTY_OPENAI_RESP
 
+        response = self.adapter.call_with_fallback("gpt-4o-mini", _MESSAGES)
 
-if __name__ == "__main__":
-    unittest.main()
+        self.assertIs(response, _EMPTY_OPENAI_RESP)
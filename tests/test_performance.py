@@ -9,15 +9,19 @@ To run performance tests:
     RUN_PERF_TESTS=1 python -m pytest tests/test_performance.py -v
 """
 
+import gc
 import os
 import random
 import string
-import sys
 import time
+import timeit
+import tracemalloc
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+from helpers import run_stream
+from scenarios import PIPELINE_SCENARIOS
 
 from enhance import FragmentProcessor
 from punctuation_processor import FragmentCandidate, PunctuationProcessor
@@ -25,23 +29,49 @@ from punctuation_processor import FragmentCandidate, PunctuationProcessor
 # Skip performance tests by default unless RUN_PERF_TESTS env var is set
 SKIP_PERF_TESTS = os.environ.get("RUN_PERF_TESTS", "").lower() not in ("1", "true", "yes")
 
+# Generous allocation budget (bytes) per buffered fragment, including its text
+FRAGMENT_BYTE_BUDGET = 1024
+
+
+def _measure(callable_, min_batch_ms=1.0, repeat=3):
+    """Return the per-call latency of callable_ in ms.
+
+    Calls are timed in batches of at least min_batch_ms so clock overhead is
+    amortized, and the fastest of several batches is kept to damp scheduler noise.
+    The batch-size calibration runs double as warm-up, and timeit keeps the
+    garbage collector off while a batch is timed.
+    """
+    timer = timeit.Timer(callable_)
+    number = 1
+    while timer.timeit(number) * 1000 < min_batch_ms:
+        number *= 2
+    best_total = min(timer.repeat(repeat=repeat, number=number))
+    return best_total * 1000 / number
+
 
 @unittest.skipIf(SKIP_PERF_TESTS, "Performance tests skipped. Set RUN_PERF_TESTS=1 to run.")
 class TestPerformanceMetrics(unittest.TestCase):
     """Test performance requirements for real-time processing"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.punct_processor = PunctuationProcessor()
-        self.frag_processor = FragmentProcessor()
-
-    def generate_random_text(self, word_count: int) -> str:
-        """Generate random text with specified word count"""
+    @classmethod
+    def setUpClass(cls):
+        """Build the processors and random corpora once for every latency test"""
+        cls.punct_processor = PunctuationProcessor()
+        cls.frag_processor = FragmentProcessor()
+        cls._corpora = {word_count: cls.generate_random_text(word_count) for word_count in (20, 30, 50)}
+
+    @staticmethod
+    def generate_random_text(word_count: int, seed: int = 42) -> str:
+        """Generate reproducible random text with specified word count"""
+        rng = random.Random(seed)
+        lengths = rng.choices(range(3, 11), k=word_count)
+        # One bulk draw for every character, then slice it into words
+        chars = "".join(rng.choices(string.ascii_lowercase, k=sum(lengths)))
         words = []
-        for _ in range(word_count):
-            word_length = random.randint(3, 10)
-            word = "".join(random.choices(string.ascii_lowercase, k=word_length))
-            words.append(word)
+        start = 0
+        for length in lengths:
+            words.append(chars[start : start + length])
+            start += length
         return " ".join(words)
 
     def test_fragment_detection_latency(self):
@@ -49,25 +79,23 @@ class TestPerformanceMetrics(unittest.TestCase):
         test_inputs = [
             "Short fragment",
             "This is a longer sentence with more words to process",
-            self.generate_random_text(20),
-            self.generate_random_text(50),
+            self._corpora[20],
+            self._corpora[50],
         ]
 
         latencies = []
 
         for input_text in test_inputs:
-            start_time = time.perf_counter()
-            score = self.punct_processor._calculate_fragment_score(input_text, 1000, [])
-            end_time = time.perf_counter()
-
-            latency_ms = (end_time - start_time) * 1000
+            latency_ms = _measure(
+                lambda text=input_text: self.punct_processor._calculate_fragment_score(text, 1000, [])
+            )
             latencies.append(latency_ms)
 
             # Each detection should be under 5ms
             self.assertLess(latency_ms, 5.0, f"Fragment detection took {latency_ms:.2f}ms (limit: 5ms)")
 
         # Average should be well under 5ms
-        avg_latency = sum(latencies) / len(latencies)
+        avg_latency = float(np.mean(latencies))
         self.assertLess(avg_latency, 3.0, f"Average latency {avg_latency:.2f}ms exceeds target")
 
     def test_merge_processing_latency(self):
@@ -84,18 +112,14 @@ class TestPerformanceMetrics(unittest.TestCase):
         latencies = []
 
         for fragments in test_cases:
-            start_time = time.perf_counter()
-            result = self.punct_processor._merge_fragments(fragments)
-            end_time = time.perf_counter()
-
-            latency_ms = (end_time - start_time) * 1000
+            latency_ms = _measure(lambda batch=fragments: self.punct_processor._merge_fragments(batch))
             latencies.append(latency_ms)
 
             # Each merge should be under 10ms
             self.assertLess(latency_ms, 10.0, f"Merge processing took {latency_ms:.2f}ms (limit: 10ms)")
 
         # Average should be well under 10ms
-        avg_latency = sum(latencies) / len(latencies)
+        avg_latency = float(np.mean(latencies))
         self.assertLess(avg_latency, 5.0, f"Average merge latency {avg_latency:.2f}ms exceeds target")
 
     def test_full_processing_latency(self):
@@ -104,42 +128,38 @@ class TestPerformanceMetrics(unittest.TestCase):
             "Short text",
             "This is a medium length sentence with several words",
             "This. Is. A. Heavily. Fragmented. Input. That. Should. Still. Process. Quickly.",
-            self.generate_random_text(30),
+            self._corpora[30],
         ]
 
         latencies = []
+        timestamp = time.time() * 1000
 
         for input_text in test_inputs:
-            fragments = []
-            start_time = time.perf_counter()
-            result, fragments = self.punct_processor.process_transcript(input_text, True, time.time() * 1000, fragments)
-            end_time = time.perf_counter()
-
-            latency_ms = (end_time - start_time) * 1000
+            latency_ms = _measure(
+                lambda text=input_text: self.punct_processor.process_transcript(text, True, timestamp, [])
+            )
             latencies.append(latency_ms)
 
             # Full processing should be under 10ms
             self.assertLess(latency_ms, 10.0, f"Processing took {latency_ms:.2f}ms (limit: 10ms)")
 
         # 99th percentile should be under 10ms
-        sorted_latencies = sorted(latencies)
-        p99_index = int(len(sorted_latencies) * 0.99)
-        p99_latency = sorted_latencies[min(p99_index, len(sorted_latencies) - 1)]
+        p99_latency = float(np.percentile(latencies, 99))
         self.assertLess(p99_latency, 10.0, f"99th percentile latency {p99_latency:.2f}ms exceeds limit")
 
     def test_high_frequency_input_handling(self):
         """Test handling rapid transcript updates (simulating fast speech)"""
         # Simulate 20 updates in rapid succession
-        rapid_inputs = [(f"word{i}", True, i * 50) for i in range(20)]
+        words = [f"word{i}" for i in range(20)]
+        timestamps = range(0, 20 * 50, 50)
 
+        process = self.punct_processor.process_transcript
         fragments = []
-        results = []
+        results = [None] * len(words)
 
         start_time = time.perf_counter()
-        for text, is_final, timestamp in rapid_inputs:
-            result, fragments = self.punct_processor.process_transcript(text, is_final, timestamp, fragments)
-            if result:
-                results.append(result)
+        for index, (text, timestamp) in enumerate(zip(words, timestamps)):
+            results[index], fragments = process(text, True, timestamp, fragments)
         end_time = time.perf_counter()
 
         total_time = end_time - start_time
@@ -156,53 +176,68 @@ class TestPerformanceMetrics(unittest.TestCase):
         test_cases = [
             "Simple. Fragment. Test.",
             "This. Is. A. Much. Longer. Fragmented. Text. With. Many. Periods.",
-            ". ".join(self.generate_random_text(20).split()),  # 20 word fragments
-            ". ".join(self.generate_random_text(50).split()),  # 50 word fragments
+            ". ".join(self._corpora[20].split()),  # 20 word fragments
+            ". ".join(self._corpora[50].split()),  # 50 word fragments
         ]
 
         latencies = []
 
         for fragmented_text in test_cases:
-            start_time = time.perf_counter()
-            result = self.frag_processor.reconstruct_fragments(fragmented_text)
-            end_time = time.perf_counter()
-
-            latency_ms = (end_time - start_time) * 1000
+            latency_ms = _measure(lambda text=fragmented_text: self.frag_processor.reconstruct_fragments(text))
             latencies.append(latency_ms)
 
             # Reconstruction should be fast even for large inputs
             self.assertLess(latency_ms, 20.0, f"Reconstruction took {latency_ms:.2f}ms (limit: 20ms)")
 
         # Average should be well under limit
-        avg_latency = sum(latencies) / len(latencies)
+        avg_latency = float(np.mean(latencies))
         self.assertLess(avg_latency, 10.0, f"Average reconstruction latency {avg_latency:.2f}ms")
 
     def test_memory_efficiency(self):
         """Test that fragment buffer doesn't grow unbounded"""
+        # With the default threshold a fragment never starts a buffer, so use a more sensitive
+        # processor and conjunction fragments that keep the buffer at capacity
+        processor = PunctuationProcessor(fragment_threshold=0.6)
+
         # Process many fragments
         fragments = []
         memory_snapshots = []
 
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        baseline_bytes, _ = tracemalloc.get_traced_memory()
+
         for i in range(100):
-            text = f"fragment {i}"
-            result, fragments = self.punct_processor.process_transcript(text, True, 1000 + i * 100, fragments)
+            text = f"and {i}"
+            _, fragments = processor.process_transcript(text, True, 1000 + i * 100, fragments)
 
             # Record buffer size
             memory_snapshots.append(len(fragments))
 
-        # Buffer should never exceed max_pending_fragments
+        retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+
+        # Allocations should stay bounded by what a full buffer needs, at peak and after the run
+        byte_budget = processor.max_pending_fragments * FRAGMENT_BYTE_BUDGET
+        self.assertLess(
+            peak_bytes - baseline_bytes, byte_budget, f"Peak allocation {peak_bytes - baseline_bytes} bytes"
+        )
+        self.assertLess(
+            retained_bytes - baseline_bytes, byte_budget, f"Retained {retained_bytes - baseline_bytes} bytes"
+        )
+
+        # Buffer should fill to max_pending_fragments and never exceed it
         max_buffer_size = max(memory_snapshots)
-        self.assertLessEqual(
+        self.assertEqual(
             max_buffer_size,
-            self.punct_processor.max_pending_fragments,
-            f"Buffer grew to {max_buffer_size}, exceeds limit",
+            processor.max_pending_fragments,
+            f"Buffer grew to {max_buffer_size}, expected the limit",
         )
 
         # Average buffer size should be reasonable
         avg_buffer_size = sum(memory_snapshots) / len(memory_snapshots)
         self.assertLess(
             avg_buffer_size,
-            self.punct_processor.max_pending_fragments,
+            processor.max_pending_fragments,
             f"Average buffer size {avg_buffer_size:.1f} is too high",
         )
 
@@ -213,40 +248,42 @@ class TestPerformanceMetrics(unittest.TestCase):
         words_per_second = 3
         total_words = duration_seconds * words_per_second
 
-        fragments = []
-        results = []
-        latencies = []
-
-        start_time = time.perf_counter()
+        # Build inputs up front so the timed loop measures only the processor
+        words = [f"word{i % 100}" for i in range(total_words)]  # Cycle through 100 different words
+        timestamps = [1000 + (i * 333) for i in range(total_words)]  # ~3 words per second
 
-        for i in range(total_words):
-            word = f"word{i % 100}"  # Cycle through 100 different words
-            timestamp = 1000 + (i * 333)  # ~3 words per second
+        process = self.punct_processor.process_transcript
+        perf_counter = time.perf_counter
+        fragments = []
+        results = [None] * total_words
+        latencies = np.empty(total_words, dtype=np.float64)
 
-            iter_start = time.perf_counter()
-            result, fragments = self.punct_processor.process_transcript(word, True, timestamp, fragments)
-            iter_end = time.perf_counter()
+        # Warm up on a throwaway buffer, then keep collector pauses out of the per-call samples
+        process(words[0], True, timestamps[0], [])
+        gc.collect()
+        gc.disable()
+        self.addCleanup(gc.enable)
 
-            if result:
-                results.append(result)
+        start_time = perf_counter()
 
-            latencies.append((iter_end - iter_start) * 1000)
+        for i, (word, timestamp) in enumerate(zip(words, timestamps)):
+            iter_start = perf_counter()
+            results[i], fragments = process(word, True, timestamp, fragments)
+            latencies[i] = (perf_counter() - iter_start) * 1000
 
-        end_time = time.perf_counter()
+        end_time = perf_counter()
+        gc.enable()
         total_time = end_time - start_time
 
         # Should complete in reasonable time
         self.assertLess(total_time, 5.0, f"Sustained load test took {total_time:.2f}s (limit: 5s)")
 
         # 99th percentile latency should remain low
-        sorted_latencies = sorted(latencies)
-        p99_index = int(len(sorted_latencies) * 0.99)
-        p99_latency = sorted_latencies[p99_index]
+        p99_latency = float(np.percentile(latencies, 99))
         self.assertLess(p99_latency, 10.0, f"99th percentile under load: {p99_latency:.2f}ms")
 
         # Median latency should be very low
-        median_index = len(sorted_latencies) // 2
-        median_latency = sorted_latencies[median_index]
+        median_latency = float(np.percentile(latencies, 50))
         self.assertLess(median_latency, 2.0, f"Median latency under load: {median_latency:.2f}ms")
 
 
@@ -254,26 +291,22 @@ class TestPerformanceMetrics(unittest.TestCase):
 class TestThroughputBenchmarks(unittest.TestCase):
     """Test throughput capabilities of the processing pipeline"""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up test fixtures"""
-        self.punct_processor = PunctuationProcessor()
-        self.frag_processor = FragmentProcessor()
+        cls.punct_processor = PunctuationProcessor()
+        cls.frag_processor = FragmentProcessor()
 
     def test_words_per_second_throughput(self):
         """Test maximum words per second throughput"""
         # Generate test data
         num_words = 1000
-        words = [f"word{i}" for i in range(num_words)]
-
-        fragments = []
-        results = []
+        items = [(f"word{i}", True, 1000 + i * 10) for i in range(num_words)]
 
         start_time = time.perf_counter()
 
-        for i, word in enumerate(words):
-            result, fragments = self.punct_processor.process_transcript(word, True, 1000 + i * 10, fragments)
-            if result:
-                results.append(result)
+        # One batch call keeps the per-word loop inside the processor
+        self.punct_processor.process_transcripts(items, [])
 
         end_time = time.perf_counter()
         elapsed_seconds = end_time - start_time
@@ -313,36 +346,63 @@ class TestThroughputBenchmarks(unittest.TestCase):
 
         print(f"\nReconstruction throughput: {sentences_per_second:.0f} sentences/second")
 
+    def test_integration_scenario_throughput(self):
+        """Test end-to-end throughput over the integration test scenarios"""
+        # Same inputs as the integration suite, so regressions there show up here as a rate drop
+        batches = [[(text, True, timestamp) for text, timestamp in inputs] for _, inputs, _, _ in PIPELINE_SCENARIOS]
+        rounds = 200
+
+        start_time = time.perf_counter()
+
+        for _ in range(rounds):
+            for batch in batches:
+                run_stream(self.punct_processor, batch)
+
+        end_time = time.perf_counter()
+        elapsed_seconds = end_time - start_time
+
+        scenarios_per_second = rounds * len(batches) / elapsed_seconds
+
+        # Should replay at least 500 short scenarios per second
+        self.assertGreater(scenarios_per_second, 500, f"Scenario throughput {scenarios_per_second:.0f} scenarios/sec")
+
+        print(f"\nScenario throughput: {scenarios_per_second:.0f} scenarios/second")
+
     def test_parallel_processing_simulation(self):
         """Simulate parallel processing of multiple streams"""
         # Simulate 5 concurrent transcription streams
         num_streams = 5
         words_per_stream = 100
 
-        streams = []
-        for stream_id in range(num_streams):
-            processor = PunctuationProcessor()
+        processors = [PunctuationProcessor() for _ in range(num_streams)]
+        stream_words = [
+            [f"stream{stream_id}_word{word_index}" for word_index in range(words_per_stream)]
+            for stream_id in range(num_streams)
+        ]
+        timestamps = [1000 + word_index * 100 for word_index in range(words_per_stream)]
+
+        def _feed_stream(words, processor):
+            """Feed one stream's words through its own processor"""
+            process = processor.process_transcript
             fragments = []
-            stream_data = {"processor": processor, "fragments": fragments, "results": []}
-            streams.append(stream_data)
+            results = []
+            for word, timestamp in zip(words, timestamps):
+                result, fragments = process(word, True, timestamp, fragments)
+                if result:
+                    results.append(result)
+            return results
 
         start_time = time.perf_counter()
 
-        # Process words round-robin across streams
-        for word_index in range(words_per_stream):
-            for stream_id, stream in enumerate(streams):
-                word = f"stream{stream_id}_word{word_index}"
-                timestamp = 1000 + word_index * 100
-
-                result, stream["fragments"] = stream["processor"].process_transcript(
-                    word, True, timestamp, stream["fragments"]
-                )
-                if result:
-                    stream["results"].append(result)
+        # Each stream owns its processor and buffer, so streams run concurrently
+        with ThreadPoolExecutor(max_workers=num_streams) as executor:
+            stream_results = list(executor.map(_feed_stream, stream_words, processors))
 
         end_time = time.perf_counter()
         elapsed_seconds = end_time - start_time
 
+        self.assertEqual(len(stream_results), num_streams)
+
         total_words = num_streams * words_per_stream
         words_per_second = total_words / elapsed_seconds
 
@@ -372,48 +432,37 @@ class PerformanceBenchmarks:
         processor = PunctuationProcessor()
         test_text = "This is a test sentence for benchmarking"
 
-        start = time.perf_counter()
-        processor._calculate_fragment_score(test_text, 1000, [])
-        end = time.perf_counter()
+        # Best of five batches, so one GC or scheduler spike can't flip the verdict
+        actual_ms = _measure(lambda: processor._calculate_fragment_score(test_text, 1000, []), repeat=5)
 
         results["fragment_detection"] = {
-            "actual_time": (end - start) * 1000,
+            "actual_time": actual_ms,
             "max_allowed": cls.BENCHMARKS["fragment_detection"],
-            "passed": (end - start) * 1000 <= cls.BENCHMARKS["fragment_detection"],
+            "passed": actual_ms <= cls.BENCHMARKS["fragment_detection"],
         }
 
         # Merge processing benchmark
         fragments = [FragmentCandidate(f"word{i}", 1000 + i * 100, 0.7) for i in range(5)]
 
-        start = time.perf_counter()
-        processor._merge_fragments(fragments)
-        end = time.perf_counter()
+        actual_ms = _measure(lambda: processor._merge_fragments(fragments), repeat=5)
 
         results["merge_processing"] = {
-            "actual_time": (end - start) * 1000,
+            "actual_time": actual_ms,
             "max_allowed": cls.BENCHMARKS["merge_processing"],
-            "passed": (end - start) * 1000 <= cls.BENCHMARKS["merge_processing"],
+            "passed": actual_ms <= cls.BENCHMARKS["merge_processing"],
         }
 
         return results
 
 
-if __name__ == "__main__":
-    if SKIP_PERF_TESTS:
-        print("\nPerformance tests skipped. Set RUN_PERF_TESTS=1 to run.")
-        print("Example: RUN_PERF_TESTS=1 python -m pytest tests/test_performance.py -v\n")
-    else:
-        # Run benchmarks if executing directly
-        print("\nRunning performance benchmarks...")
-        benchmarks = PerformanceBenchmarks.run_all_benchmarks()
-
-        print("\nBenchmark Results:")
-        print("-" * 50)
-        for name, result in benchmarks.items():
-            status = "✓ PASS" if result["passed"] else "✗ FAIL"
-            print(f"{name:20} {result['actual_time']:6.2f}ms / {result['max_allowed']:6.2f}ms  {status}")
-
-        print("\n")
-
-    # Run unit tests
-    unittest.main(verbosity=2)
+@unittest.skipIf(SKIP_PERF_TESTS, "Performance tests skipped. Set RUN_PERF_TESTS=1 to run.")
+class TestBenchmarkTargets(unittest.TestCase):
+    """Check the sprint benchmarks against their time budgets"""
+
+    def test_benchmarks_meet_targets(self):
+        """Test each benchmark stays within its allowed time"""
+        for name, result in PerformanceBenchmarks.run_all_benchmarks().items():
+            with self.subTest(benchmark=name):
+                self.assertTrue(
+                    result["passed"], f"{name}: {result['actual_time']:.2f}ms / {result['max_allowed']:.2f}ms"
+                )
@@ -7,21 +7,72 @@ merging logic, configuration handling, and edge cases.
 
 import unittest
 
+import pytest
+from helpers import final_items, run_stream
+
 # Import the classes to test
 from punctuation_processor import FragmentCandidate, PunctuationProcessor
 
+# Sensitive configuration shared by the class-based tests and the processor fixture
+_SENSITIVE_CONFIG = {
+    "merge_threshold_ms": 800,
+    "min_sentence_length": 3,
+    "fragment_threshold": 0.6,  # More sensitive to catch obvious fragments
+    "max_pending_fragments": 5,
+}
+
+# Input tables shared by the table-driven tests
+_INTERIM_TEXTS = ("hello world", "this is a partial", "and then")
+_BLANK_TEXTS = ("", "   ", "\t", "\n")
+_SHORT_FRAGMENTS = ("and", "but then", "so we")
+_COMPLETE_SENTENCES = (
+    "This is a complete sentence with enough words.",
+    "The weather today is absolutely beautiful and sunny.",
+    "I think we should go to the store later.",
+)
+_LOWERCASE_TEXTS = ("and then we went", "but wait for me", "so it was")
+_CONJUNCTIONS = ("and then", "but wait", "so we", "however it", "therefore I")
+_PREPOSITIONS = ("in the", "on top", "with me", "from here")
+_INCOMPLETE_ENDINGS = ("give me the", "this is a", "some of those")
+_COMPLETE_RESPONSES = ("yes", "okay", "hello", "thanks")
+
+# Timestamps following a fragment at 1000ms: rapid succession (200ms gap), long pause (1000ms gap)
+_TIMING_TIMESTAMPS = (1200, 2000)
+
+# Canonical fragment buffers; the processor never mutates candidates, so tests pass list() copies
+_HELLO = FragmentCandidate("Hello", 1000, 0.8)
+_HELLO_WORLD_PAIR = (_HELLO, FragmentCandidate("world", 1100, 0.9))
+_GOOD_MORNING_PAIR = (FragmentCandidate("Good morning", 1000, 0.3), FragmentCandidate(", everyone", 1100, 0.9))
+_WENT_TO_STORE_SEQ = (
+    FragmentCandidate("I", 1000, 0.4),
+    FragmentCandidate("went", 1100, 0.8),
+    FragmentCandidate("to", 1200, 0.9),
+    FragmentCandidate("the store", 1300, 0.3),
+)
+_SPACED_PAIR = (FragmentCandidate("Hello ", 1000, 0.5), FragmentCandidate(" world", 1100, 0.7))
+
+# (text, timestamp) sequences for the end-to-end scenarios
+# "Hello" -> "world" -> "How are you doing today?"
+_BASIC_SCENARIO = (("Hello", 1000), ("world", 1100), ("How are you doing today?", 1500))
+# "Good morning" -> "everyone" -> ". Let's" -> "begin the meeting"
+_COMPLEX_SCENARIO = (
+    ("Good morning", 1000),
+    ("everyone", 1200),
+    (". Let's", 1800),  # Longer pause
+    ("begin the meeting", 2000),
+)
+
 
 class TestPunctuationProcessor(unittest.TestCase):
     """Test cases for PunctuationProcessor class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures."""
+        cls.processor = PunctuationProcessor(**_SENSITIVE_CONFIG)
+
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.processor = PunctuationProcessor(
-            merge_threshold_ms=800,
-            min_sentence_length=3,
-            fragment_threshold=0.6,  # More sensitive to catch obvious fragments
-            max_pending_fragments=5,
-        )
         self.empty_fragments = []
 
     def test_initialization(self):
@@ -44,14 +95,13 @@ class TestPunctuationProcessor(unittest.TestCase):
 
     def test_interim_results_passthrough(self):
         """Test that interim (non-final) results pass through unchanged."""
-        test_cases = ["hello world", "this is a partial", "and then"]
-
-        for text in test_cases:
-            result, fragments = self.processor.process_transcript(
-                text, is_final=False, timestamp=1000, pending_fragments=self.empty_fragments
-            )
-            self.assertEqual(result, text)
-            self.assertEqual(fragments, self.empty_fragments)
+        for text in _INTERIM_TEXTS:
+            with self.subTest(text=text):
+                result, fragments = self.processor.process_transcript(
+                    text, is_final=False, timestamp=1000, pending_fragments=self.empty_fragments
+                )
+                self.assertEqual(result, text)
+                self.assertEqual(fragments, self.empty_fragments)
 
         # Test empty string separately since it returns None
         result, fragments = self.processor.process_transcript(
@@ -62,40 +112,21 @@ class TestPunctuationProcessor(unittest.TestCase):
 
     def test_empty_text_handling(self):
         """Test handling of empty or whitespace-only text."""
-        test_cases = ["", "   ", "\t", "\n"]
-
-        for text in test_cases:
-            result, fragments = self.processor.process_transcript(
-                text, is_final=True, timestamp=1000, pending_fragments=self.empty_fragments
-            )
-            self.assertIsNone(result)
-            self.assertEqual(fragments, self.empty_fragments)
-
-    def test_fragment_detection_length(self):
-        """Test fragment detection based on text length."""
-        # Test obvious fragments (short length)
-        short_fragments = ["and", "but then", "so we"]
-        for text in short_fragments:
-            score = self.processor._calculate_fragment_score(text, 1000, self.empty_fragments)
-            self.assertGreater(score, 0.3, f"'{text}' should have high fragment score")
-
-        # Test complete sentences (longer length)
-        complete_sentences = [
-            "This is a complete sentence with enough words.",
-            "The weather today is absolutely beautiful and sunny.",
-            "I think we should go to the store later.",
-        ]
-        for text in complete_sentences:
-            score = self.processor._calculate_fragment_score(text, 1000, self.empty_fragments)
-            self.assertLess(score, 0.5, f"'{text}' should have low fragment score")
+        for text in _BLANK_TEXTS:
+            with self.subTest(text=text):
+                result, fragments = self.processor.process_transcript(
+                    text, is_final=True, timestamp=1000, pending_fragments=self.empty_fragments
+                )
+                self.assertIsNone(result)
+                self.assertEqual(fragments, self.empty_fragments)
 
     def test_fragment_detection_capitalization(self):
         """Test fragment detection based on capitalization patterns."""
         # Lowercase start suggests continuation (higher score)
-        lowercase_texts = ["and then we went", "but wait for me", "so it was"]
-        for text in lowercase_texts:
-            score = self.processor._calculate_fragment_score(text, 1000, self.empty_fragments)
-            self.assertGreater(score, 0.4, f"'{text}' should have fragment score due to lowercase")
+        for text in _LOWERCASE_TEXTS:
+            with self.subTest(text=text):
+                score = self.processor._calculate_fragment_score(text, 1000, self.empty_fragments)
+                self.assertGreater(score, 0.4, "should have fragment score due to lowercase")
 
         # Proper capitalization suggests new sentence (lower capitalization component)
         proper_texts = ["And then we went to the store", "But we can do better than that"]
@@ -111,77 +142,32 @@ class TestPunctuationProcessor(unittest.TestCase):
         """Test fragment detection based on timing patterns."""
         pending_fragments = [FragmentCandidate("Hello", 1000, 0.5)]
 
-        # Test rapid succession (should increase fragment score)
-        rapid_text = "world"
-        rapid_score = self.processor._calculate_fragment_score(
-            rapid_text,
-            1200,
-            pending_fragments,  # 200ms gap
-        )
-
-        # Test long pause (should decrease fragment score)
-        delayed_text = "world"
-        delayed_score = self.processor._calculate_fragment_score(
-            delayed_text,
-            2000,
-            pending_fragments,  # 1000ms gap
+        # Score the same continuation at each timestamp, rapid succession first
+        rapid_score, delayed_score = (
+            self.processor._calculate_fragment_score("world", timestamp, pending_fragments)
+            for timestamp in _TIMING_TIMESTAMPS
         )
 
         self.assertGreater(rapid_score, delayed_score, "Rapid succession should have higher fragment score")
 
-    def test_grammar_pattern_analysis(self):
-        """Test grammatical pattern recognition for fragment detection."""
-        # Test conjunction starters (high fragment score)
-        conjunctions = ["and then", "but wait", "so we", "however it", "therefore I"]
-        for text in conjunctions:
-            score = self.processor._analyze_grammar_patterns(text)
-            self.assertGreater(score, 0.8, f"'{text}' should have high grammar fragment score")
-
-        # Test preposition starters (moderate fragment score)
-        prepositions = ["in the", "on top", "with me", "from here"]
-        for text in prepositions:
-            score = self.processor._analyze_grammar_patterns(text)
-            self.assertGreater(score, 0.4, f"'{text}' should have moderate grammar fragment score")
-
-        # Test incomplete endings (high fragment score)
-        incomplete = ["give me the", "this is a", "some of those"]
-        for text in incomplete:
-            score = self.processor._analyze_grammar_patterns(text)
-            self.assertGreater(score, 0.5, f"'{text}' should have high grammar fragment score")
-
-        # Test complete responses (low fragment score)
-        complete = ["yes", "okay", "hello", "thanks"]
-        for text in complete:
-            score = self.processor._analyze_grammar_patterns(text)
-            self.assertLess(score, 0.5, f"'{text}' should have low grammar fragment score")
-
     def test_fragment_merging_basic(self):
         """Test basic fragment merging functionality."""
         # Test merging simple fragments
-        fragments = [FragmentCandidate("Hello", 1000, 0.8), FragmentCandidate("world", 1100, 0.9)]
-        merged = self.processor._merge_fragments(fragments)
+        merged = self.processor._merge_fragments(list(_HELLO_WORLD_PAIR))
         self.assertEqual(merged, "Hello world")
 
         # Test merging with punctuation
-        fragments_punct = [FragmentCandidate("Good morning", 1000, 0.3), FragmentCandidate(", everyone", 1100, 0.9)]
-        merged_punct = self.processor._merge_fragments(fragments_punct)
+        merged_punct = self.processor._merge_fragments(list(_GOOD_MORNING_PAIR))
         self.assertEqual(merged_punct, "Good morning, everyone")
 
     def test_fragment_merging_complex(self):
         """Test complex fragment merging scenarios."""
         # Test multiple fragment merge
-        fragments = [
-            FragmentCandidate("I", 1000, 0.4),
-            FragmentCandidate("went", 1100, 0.8),
-            FragmentCandidate("to", 1200, 0.9),
-            FragmentCandidate("the store", 1300, 0.3),
-        ]
-        merged = self.processor._merge_fragments(fragments)
+        merged = self.processor._merge_fragments(list(_WENT_TO_STORE_SEQ))
         self.assertEqual(merged, "I went to the store")
 
         # Test merging with existing spaces
-        fragments_spaces = [FragmentCandidate("Hello ", 1000, 0.5), FragmentCandidate(" world", 1100, 0.7)]
-        merged_spaces = self.processor._merge_fragments(fragments_spaces)
+        merged_spaces = self.processor._merge_fragments(list(_SPACED_PAIR))
         self.assertIn("Hello", merged_spaces)
         self.assertIn("world", merged_spaces)
 
@@ -222,14 +208,18 @@ class TestPunctuationProcessor(unittest.TestCase):
     def test_buffer_size_limit(self):
         """Test that fragment buffer respects size limits."""
         # Use obvious fragments to fill buffer to capacity
+        limit = self.processor.max_pending_fragments
+        texts = [f"and {i}" for i in range(limit)]  # Use conjunction to ensure high fragment score
         fragments = []
-        for i in range(self.processor.max_pending_fragments):
-            text = f"and {i}"  # Use conjunction to ensure high fragment score
+        results = []
+        for i, text in enumerate(texts):
             result, fragments = self.processor.process_transcript(
                 text, is_final=True, timestamp=1000 + i * 100, pending_fragments=fragments
             )
-            if i < self.processor.max_pending_fragments - 1:
-                self.assertIsNone(result)  # Should be buffered
+            results.append(result)
+
+        # All but the last should be buffered
+        self.assertEqual(results[:-1], [None] * (limit - 1))
 
         # Verify buffer is at capacity
         self.assertEqual(len(fragments), self.processor.max_pending_fragments)
@@ -249,7 +239,7 @@ class TestPunctuationProcessor(unittest.TestCase):
     def test_timing_based_merging(self):
         """Test merging decisions based on timing thresholds."""
         # Test within merge threshold
-        fragments_rapid = [FragmentCandidate("Hello", 1000, 0.8)]
+        fragments_rapid = [_HELLO]
         result_rapid, fragments_after_rapid = self.processor.process_transcript(
             "world",
             is_final=True,
@@ -259,7 +249,7 @@ class TestPunctuationProcessor(unittest.TestCase):
         # Should likely be held for merging due to timing
 
         # Test beyond merge threshold
-        fragments_delayed = [FragmentCandidate("Hello", 1000, 0.8)]
+        fragments_delayed = [_HELLO]
         result_delayed, fragments_after_delayed = self.processor.process_transcript(
             "Different sentence",
             is_final=True,
@@ -271,7 +261,7 @@ class TestPunctuationProcessor(unittest.TestCase):
     def test_flush_pending_fragments(self):
         """Test manual flushing of pending fragments."""
         # Create some pending fragments
-        fragments = [FragmentCandidate("Hello", 1000, 0.8), FragmentCandidate("world", 1100, 0.9)]
+        fragments = list(_HELLO_WORLD_PAIR)
 
         # Test flush
         result, remaining = self.processor.flush_pending_fragments(fragments)
@@ -283,6 +273,37 @@ class TestPunctuationProcessor(unittest.TestCase):
         self.assertIsNone(result_empty)
         self.assertEqual(remaining_empty, [])
 
+    def test_process_transcripts_matches_sequential_calls(self):
+        """Test batch processing emits the same results as per-segment calls."""
+        items = [
+            ("Hello", True, 1000),
+            ("world", True, 1100),
+            ("still typing", False, 1200),
+            ("", True, 1300),
+            ("How are you doing today?", True, 1500),
+            ("and then", True, 1600),
+        ]
+
+        expected = []
+        fragments = []
+        for text, is_final, timestamp in items:
+            result, fragments = self.processor.process_transcript(text, is_final, timestamp, fragments)
+            if result:
+                expected.append(result)
+
+        results, batch_fragments = self.processor.process_transcripts(items, [])
+        self.assertEqual(results, expected)
+        self.assertEqual(batch_fragments, fragments)
+
+    def test_process_transcripts_leaves_caller_buffer_untouched(self):
+        """Test the batch path updates its own copy of the fragment buffer."""
+        pending = [_HELLO]
+
+        _, fragments = self.processor.process_transcripts([("world", True, 1100), ("and then", True, 1200)], pending)
+
+        self.assertEqual(pending, [_HELLO])
+        self.assertIsNot(fragments, pending)
+
     def test_error_handling(self):
         """Test error handling and fallback behavior."""
         # Test with None input - should handle gracefully
@@ -345,30 +366,11 @@ class TestPunctuationProcessor(unittest.TestCase):
         self.assertEqual(stats["max_pending_fragments"], 5)
         self.assertIsInstance(stats["weights"], dict)
 
+    @pytest.mark.slow
     def test_integration_scenario_basic(self):
         """Test a realistic transcript processing scenario."""
         # Simulate a realistic conversation flow
-        fragments = []
-        results = []
-
-        # Fragment sequence: "Hello" -> "world" -> "How are you doing today?"
-        result1, fragments = self.processor.process_transcript(
-            "Hello", is_final=True, timestamp=1000, pending_fragments=fragments
-        )
-        if result1:
-            results.append(result1)
-
-        result2, fragments = self.processor.process_transcript(
-            "world", is_final=True, timestamp=1100, pending_fragments=fragments
-        )
-        if result2:
-            results.append(result2)
-
-        result3, fragments = self.processor.process_transcript(
-            "How are you doing today?", is_final=True, timestamp=1500, pending_fragments=fragments
-        )
-        if result3:
-            results.append(result3)
+        results, _ = self.processor.process_transcripts(final_items(_BASIC_SCENARIO), [])
 
         # Verify we got meaningful output
         all_text = " ".join(results)
@@ -376,31 +378,11 @@ class TestPunctuationProcessor(unittest.TestCase):
         self.assertIn("world", all_text)
         self.assertIn("How are you doing today", all_text)
 
+    @pytest.mark.slow
     def test_integration_scenario_complex(self):
         """Test complex realistic scenario with mixed content."""
-        fragments = []
-        results = []
-
-        # Simulate: "Good morning" -> "everyone" -> ". Let's" -> "begin the meeting"
-        test_sequence = [
-            ("Good morning", 1000),
-            ("everyone", 1200),
-            (". Let's", 1800),  # Longer pause
-            ("begin the meeting", 2000),
-        ]
-
-        for text, timestamp in test_sequence:
-            result, fragments = self.processor.process_transcript(
-                text, is_final=True, timestamp=timestamp, pending_fragments=fragments
-            )
-            if result:
-                results.append(result)
-
         # Force flush any remaining fragments
-        if fragments:
-            final_result, _ = self.processor.flush_pending_fragments(fragments)
-            if final_result:
-                results.append(final_result)
+        results = run_stream(self.processor, final_items(_COMPLEX_SCENARIO))
 
         # Verify coherent output
         all_text = " ".join(results)
@@ -430,5 +412,36 @@ class TestFragmentCandidate(unittest.TestCase):
         self.assertNotEqual(fragment1, fragment3)
 
 
-if __name__ == "__main__":
-    unittest.main(verbosity=2)
+@pytest.fixture(scope="module")
+def processor():
+    """Processor with the sensitive configuration for the parametrized tests."""
+    return PunctuationProcessor(**_SENSITIVE_CONFIG)
+
+
+@pytest.mark.parametrize("text", _SHORT_FRAGMENTS)
+def test_short_text_scores_as_fragment(processor, text):
+    """Test obvious fragments (short length) get a high fragment score."""
+    assert processor._calculate_fragment_score(text, 1000, []) > 0.3
+
+
+@pytest.mark.parametrize("text", _COMPLETE_SENTENCES)
+def test_complete_sentence_scores_low(processor, text):
+    """Test complete sentences (longer length) get a low fragment score."""
+    assert processor._calculate_fragment_score(text, 1000, []) < 0.5
+
+
+@pytest.mark.parametrize(
+    "text,bound",
+    [(text, 0.8) for text in _CONJUNCTIONS]  # Conjunction starters (high)
+    + [(text, 0.4) for text in _PREPOSITIONS]  # Preposition starters (moderate)
+    + [(text, 0.5) for text in _INCOMPLETE_ENDINGS],  # Incomplete endings (high)
+)
+def test_grammar_fragment_patterns(processor, text, bound):
+    """Test grammatical fragment patterns score above their bound."""
+    assert processor._analyze_grammar_patterns(text) > bound
+
+
+@pytest.mark.parametrize("text", _COMPLETE_RESPONSES)
+def test_grammar_complete_responses(processor, text):
+    """Test single-word complete responses get a low grammar fragment score."""
+    assert processor._analyze_grammar_patterns(text) < 0.5
@@ -6,52 +6,21 @@ These tests validate the punctuation processing system against realistic
 speech patterns and use cases that users encounter in daily usage.
 """
 
-import os
-import sys
 import unittest
-from typing import List
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from test_data_generator import TestDataGenerator, TranscriptEvent
+import pytest
+from helpers import final_items, run_stream
+from test_data_generator import TranscriptEvent
 
 from enhance import FragmentProcessor
 from punctuation_processor import PunctuationProcessor
 
-
-class TestUserAcceptanceScenarios(unittest.TestCase):
-    """Test realistic user scenarios with expected behaviors"""
-
-    def setUp(self):
-        """Set up test fixtures"""
-        self.punct_processor = PunctuationProcessor()
-        self.frag_processor = FragmentProcessor()
-        self.data_generator = TestDataGenerator(seed=42)
-
-    def process_transcript_stream(self, events: List[TranscriptEvent]) -> str:
-        """Process a stream of transcript events and return final text"""
-        results = []
-        fragments = []
-
-        for event in events:
-            result, fragments = self.punct_processor.process_transcript(
-                event.text, event.is_final, event.timestamp, fragments
-            )
-            if result:
-                results.append(result)
-
-        # Flush any remaining fragments
-        if fragments:
-            final_result, _ = self.punct_processor.flush_pending_fragments(fragments)
-            if final_result:
-                results.append(final_result)
-
-        return " ".join(results)
-
-    def test_business_meeting_scenario(self):
-        """Test transcription of a typical business meeting"""
-        meeting_events = [
+# (name, events, expected substrings, expected case-insensitive substrings, max periods or None)
+SCENARIOS = [
+    # Typical business meeting: professional structure, key terms, no excessive fragmentation
+    (
+        "business_meeting",
+        (
             TranscriptEvent("Good morning everyone", True, 1000),
             TranscriptEvent("thank you for joining", True, 1200),
             TranscriptEvent("today's quarterly review", True, 1400),
@@ -63,22 +32,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("However", True, 7000),
             TranscriptEvent("we need to address", True, 7200),
             TranscriptEvent("the supply chain issues", True, 7400),
-        ]
-
-        result = self.process_transcript_stream(meeting_events)
-
-        # Should maintain professional structure
-        self.assertIn("Good morning everyone", result)
-        self.assertIn("Revenue is up", result)
-        # Should not have excessive fragmentation
-        self.assertLess(result.count("."), 6)
-        # Key business terms preserved
-        self.assertIn("quarterly review", result.lower())
-        self.assertIn("supply chain", result.lower())
-
-    def test_technical_support_call(self):
-        """Test technical support conversation"""
-        support_events = [
+        ),
+        ("Good morning everyone", "Revenue is up"),
+        ("quarterly review", "supply chain"),
+        6,
+    ),
+    # Technical support call: technical terms, question structure, single-word responses
+    (
+        "technical_support_call",
+        (
             TranscriptEvent("Hello", True, 1000),
             TranscriptEvent("I'm having trouble", True, 2000),
             TranscriptEvent("with my computer", True, 2200),
@@ -91,21 +53,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("several times", True, 5200),
             TranscriptEvent("but the problem", True, 5400),
             TranscriptEvent("persists", True, 5600),
-        ]
-
-        result = self.process_transcript_stream(support_events)
-
-        # Should handle technical terms
-        self.assertIn("computer", result.lower())
-        self.assertIn("applications", result.lower())
-        # Should preserve question structure
-        self.assertIn("Have you tried", result)
-        # Single word responses should be preserved
-        self.assertIn("Yes", result)
-
-    def test_medical_consultation(self):
-        """Test medical consultation with abbreviations"""
-        medical_events = [
+        ),
+        ("Have you tried", "Yes"),
+        ("computer", "applications"),
+        None,
+    ),
+    # Medical consultation: abbreviations, numbers and measurements
+    (
+        "medical_consultation",
+        (
             TranscriptEvent("The patient visited Dr.", True, 1000),
             TranscriptEvent("Smith", True, 1100),
             TranscriptEvent("on Jan.", True, 1300),
@@ -116,21 +72,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("degrees", True, 3200),
             TranscriptEvent("Prescribed 500 mg", True, 4000),
             TranscriptEvent("twice daily", True, 4200),
-        ]
-
-        result = self.process_transcript_stream(medical_events)
-
-        # Should preserve medical abbreviations
-        self.assertIn("Dr.", result)
-        self.assertIn("Jan.", result)
-        # Should preserve numbers and measurements
-        self.assertIn("120", result)
-        self.assertIn("98.6", result)
-        self.assertIn("500 mg", result)
-
-    def test_educational_lecture(self):
-        """Test educational lecture with structured content"""
-        lecture_events = [
+        ),
+        ("Dr.", "Jan.", "120", "98.6", "500 mg"),
+        (),
+        None,
+    ),
+    # Educational lecture: structure markers and topic coherence
+    (
+        "educational_lecture",
+        (
             TranscriptEvent("Today we'll discuss", True, 1000),
             TranscriptEvent("three main topics", True, 1200),
             TranscriptEvent("First", True, 3000),
@@ -143,22 +93,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("Third", True, 7000),
             TranscriptEvent("future developments", True, 7200),
             TranscriptEvent("and ethical considerations", True, 7400),
-        ]
-
-        result = self.process_transcript_stream(lecture_events)
-
-        # Should preserve structure markers
-        self.assertIn("First", result)
-        self.assertIn("Second", result)
-        self.assertIn("Third", result)
-        # Should maintain topic coherence
-        self.assertIn("artificial intelligence", result.lower())
-        self.assertIn("healthcare", result.lower())
-        self.assertIn("ethical considerations", result.lower())
-
-    def test_casual_conversation(self):
-        """Test casual conversation with colloquialisms"""
-        casual_events = [
+        ),
+        ("First", "Second", "Third"),
+        ("artificial intelligence", "healthcare", "ethical considerations"),
+        None,
+    ),
+    # Casual conversation: colloquialisms and informal responses
+    (
+        "casual_conversation",
+        (
             TranscriptEvent("Hey", True, 1000),
             TranscriptEvent("what's up", True, 1200),
             TranscriptEvent("Not much", True, 2000),
@@ -168,20 +111,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("some coffee", True, 3400),
             TranscriptEvent("Sure", True, 4000),
             TranscriptEvent("let's go", True, 4200),
-        ]
-
-        result = self.process_transcript_stream(casual_events)
-
-        # Should handle casual language
-        self.assertIn("Hey", result)
-        self.assertIn("what's up", result.lower())
-        # Should preserve informal responses
-        self.assertIn("Cool", result)
-        self.assertIn("Sure", result)
-
-    def test_customer_service_interaction(self):
-        """Test customer service phone interaction"""
-        service_events = [
+        ),
+        ("Hey", "Cool", "Sure"),
+        ("what's up",),
+        None,
+    ),
+    # Customer service call: polite phrasing and service terminology
+    (
+        "customer_service_interaction",
+        (
             TranscriptEvent("Thank you for calling", True, 1000),
             TranscriptEvent("customer service", True, 1200),
             TranscriptEvent("How may I", True, 1400),
@@ -194,19 +132,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("with that", True, 5400),
             TranscriptEvent("May I have", True, 5600),
             TranscriptEvent("your order number", True, 5800),
-        ]
-
-        result = self.process_transcript_stream(service_events)
-
-        # Should maintain polite phrasing
-        self.assertIn("Thank you for calling", result)
-        self.assertIn("How may I help you", result)
-        # Should handle service terminology
-        self.assertIn("order number", result.lower())
-
-    def test_news_broadcast_style(self):
-        """Test news broadcast style speech"""
-        news_events = [
+        ),
+        ("Thank you for calling", "How may I help you"),
+        ("order number",),
+        None,
+    ),
+    # News broadcast: structure, proper nouns, formal tone
+    (
+        "news_broadcast_style",
+        (
             TranscriptEvent("Breaking news", True, 1000),
             TranscriptEvent("this morning", True, 1200),
             TranscriptEvent("The stock market", True, 2000),
@@ -218,21 +152,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("lawmakers continue", True, 4400),
             TranscriptEvent("to debate", True, 4600),
             TranscriptEvent("the new bill", True, 4800),
-        ]
-
-        result = self.process_transcript_stream(news_events)
-
-        # Should maintain news structure
-        self.assertIn("Breaking news", result)
-        self.assertIn("Meanwhile", result)
-        # Should preserve proper nouns
-        self.assertIn("Washington", result)
-        # Should maintain formal tone
-        self.assertIn("stock market", result.lower())
-
-    def test_recipe_instructions(self):
-        """Test recipe/instructional content"""
-        recipe_events = [
+        ),
+        ("Breaking news", "Meanwhile", "Washington"),
+        ("stock market",),
+        None,
+    ),
+    # Recipe instructions: instructional markers and measurements
+    (
+        "recipe_instructions",
+        (
             TranscriptEvent("First", True, 1000),
             TranscriptEvent("preheat the oven", True, 1200),
             TranscriptEvent("to 350 degrees", True, 1400),
@@ -244,22 +172,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("of salt", True, 4000),
             TranscriptEvent("Then", True, 5000),
             TranscriptEvent("add the wet ingredients", True, 5200),
-        ]
-
-        result = self.process_transcript_stream(recipe_events)
-
-        # Should preserve instructional markers
-        self.assertIn("First", result)
-        self.assertIn("Next", result)
-        self.assertIn("Then", result)
-        # Should preserve measurements
-        self.assertIn("350 degrees", result)
-        self.assertIn("2 cups", result)
-        self.assertIn("1 cup", result)
-
-    def test_legal_dictation(self):
-        """Test legal/formal dictation"""
-        legal_events = [
+        ),
+        ("First", "Next", "Then", "350 degrees", "2 cups", "1 cup"),
+        (),
+        None,
+    ),
+    # Legal dictation: legal terminology and formal structure
+    (
+        "legal_dictation",
+        (
             TranscriptEvent("Pursuant to", True, 1000),
             TranscriptEvent("Section 5", True, 1200),
             TranscriptEvent("subsection A", True, 1400),
@@ -270,20 +191,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("the Client", True, 3600),
             TranscriptEvent("agrees to", True, 4000),
             TranscriptEvent("the following terms", True, 4200),
-        ]
-
-        result = self.process_transcript_stream(legal_events)
-
-        # Should preserve legal terminology
-        self.assertIn("Pursuant to", result)
-        self.assertIn("subsection", result.lower())
-        self.assertIn("hereinafter", result.lower())
-        # Should maintain formal structure
-        self.assertIn("party of the first part", result.lower())
-
-    def test_sports_commentary(self):
-        """Test sports commentary style"""
-        sports_events = [
+        ),
+        ("Pursuant to",),
+        ("subsection", "hereinafter", "party of the first part"),
+        None,
+    ),
+    # Sports commentary: short excited phrases and exclamations
+    (
+        "sports_commentary",
+        (
             TranscriptEvent("And he shoots", True, 1000),
             TranscriptEvent("he scores", True, 1100),
             TranscriptEvent("What a goal", True, 1300),
@@ -293,20 +209,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("third goal", True, 3100),
             TranscriptEvent("this game", True, 3200),
             TranscriptEvent("Unbelievable", True, 4000),
-        ]
-
-        result = self.process_transcript_stream(sports_events)
-
-        # Should handle excitement and short phrases
-        self.assertIn("he shoots", result.lower())
-        self.assertIn("he scores", result.lower())
-        # Should preserve exclamations
-        self.assertIn("What a goal", result)
-        self.assertIn("Unbelievable", result)
-
-    def test_interruptions_and_corrections(self):
-        """Test handling of interruptions and self-corrections"""
-        correction_events = [
+        ),
+        ("What a goal", "Unbelievable"),
+        ("he shoots", "he scores"),
+        None,
+    ),
+    # Interruptions and self-corrections keep the corrected information
+    (
+        "interruptions_and_corrections",
+        (
             TranscriptEvent("The meeting is at", True, 1000),
             TranscriptEvent("wait no", True, 1200),
             TranscriptEvent("sorry", True, 1300),
@@ -315,19 +226,15 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("I mean", True, 3000),
             TranscriptEvent("let me check", True, 3200),
             TranscriptEvent("yes three o'clock", True, 3400),
-        ]
-
-        result = self.process_transcript_stream(correction_events)
-
-        # Should handle corrections naturally
-        self.assertIn("wait", result.lower())
-        self.assertIn("sorry", result.lower())
-        # Should preserve the corrected information
-        self.assertIn("three", result.lower())
-
-    def test_multilingual_terms(self):
-        """Test handling of foreign words and phrases"""
-        multilingual_events = [
+        ),
+        (),
+        ("wait", "sorry", "three"),
+        None,
+    ),
+    # Foreign words and phrases are preserved
+    (
+        "multilingual_terms",
+        (
             TranscriptEvent("The restaurant", True, 1000),
             TranscriptEvent("has a certain", True, 1200),
             TranscriptEvent("je ne sais quoi", True, 1400),
@@ -335,31 +242,81 @@ class TestUserAcceptanceScenarios(unittest.TestCase):
             TranscriptEvent("pasta al dente", True, 2200),
             TranscriptEvent("and crème brûlée", True, 2400),
             TranscriptEvent("Very haute cuisine", True, 3000),
-        ]
-
-        result = self.process_transcript_stream(multilingual_events)
-
-        # Should preserve foreign phrases
-        self.assertIn("je ne sais quoi", result.lower())
-        self.assertIn("al dente", result.lower())
-        self.assertIn("crème brûlée", result.lower())
+        ),
+        (),
+        ("je ne sais quoi", "al dente", "crème brûlée"),
+        None,
+    ),
+]
+
+# (text, timestamp) streams for the edge-case tests
+_MIXED_EVENTS = (
+    ("Hello everyone", 1000),
+    ("Bonjour", 1500),
+    ("How are you", 2000),
+    ("Comment allez-vous", 2500),
+    ("Let's begin", 3000),
+    ("Commençons", 3500),
+)
+_NUMERIC_EVENTS = (
+    ("123", 1000),
+    ("456", 1200),
+    ("789", 1400),
+    ("3.14159", 2000),
+    ("2.71828", 2200),
+)
+_SPECIAL_EVENTS = (
+    ("Hello @user", 1000),
+    ("#trending topic", 1200),
+    ("50% off", 1400),
+    ("$99.99", 1600),
+    ("C++ programming", 1800),
+    ("A/B testing", 2000),
+    ("24/7 support", 2200),
+)
+
+# 100 words without significant pauses, and 50 single words for the rapid-fire stream
+_LONG_TEXT = " ".join(f"word{i}" for i in range(100))
+_RAPID_WORDS = tuple(f"word{i}" for i in range(50))
+
+
+@pytest.fixture(scope="module")
+def punct_processor():
+    """Punctuation processor for the scenario tests"""
+    return PunctuationProcessor()
+
+
+@pytest.mark.parametrize(
+    "events,expected,expected_lower,max_periods",
+    [row[1:] for row in SCENARIOS],
+    ids=[row[0] for row in SCENARIOS],
+)
+def test_user_scenario(punct_processor, events, expected, expected_lower, max_periods):
+    """Test each realistic scenario keeps its expected content"""
+    result = " ".join(run_stream(punct_processor, ((event.text, event.is_final, event.timestamp) for event in events)))
+    low = result.lower()
+
+    # Check every needle so a failure lists all of the missing content at once
+    missing = [needle for needle in expected if needle not in result]
+    missing += [needle for needle in expected_lower if needle not in low]
+    assert not missing, f"Missing: {missing}"
+    if max_periods is not None:
+        # Should not have excessive fragmentation
+        assert result.count(".") < max_periods
 
 
 class TestEdgeCaseHandling(unittest.TestCase):
     """Test edge cases and error conditions in real usage"""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up test fixtures"""
-        self.punct_processor = PunctuationProcessor()
-        self.frag_processor = FragmentProcessor()
+        cls.punct_processor = PunctuationProcessor()
+        cls.frag_processor = FragmentProcessor()
 
     def test_very_long_continuous_speech(self):
         """Test handling of very long continuous speech without pauses"""
-        # Generate 100 words without significant pauses
-        words = [f"word{i}" for i in range(100)]
-        long_text = " ".join(words)
-
-        result, fragments = self.punct_processor.process_transcript(long_text, True, 1000, [])
+        result, fragments = self.punct_processor.process_transcript(_LONG_TEXT, True, 1000, [])
 
         # Should handle long input without error
         self.assertIsNotNone(result or fragments)
@@ -371,20 +328,8 @@ class TestEdgeCaseHandling(unittest.TestCase):
 
     def test_rapid_fire_single_words(self):
         """Test rapid succession of single words"""
-        results = []
-        fragments = []
-
         # 50 single words in rapid succession (20ms apart)
-        for i in range(50):
-            result, fragments = self.punct_processor.process_transcript(f"word{i}", True, 1000 + i * 20, fragments)
-            if result:
-                results.append(result)
-
-        # Flush remaining
-        if fragments:
-            final_result, _ = self.punct_processor.flush_pending_fragments(fragments)
-            if final_result:
-                results.append(final_result)
+        results = run_stream(self.punct_processor, final_items(zip(_RAPID_WORDS, range(1000, 2000, 20))))
 
         # Should produce coherent output
         all_text = " ".join(results)
@@ -394,22 +339,7 @@ class TestEdgeCaseHandling(unittest.TestCase):
 
     def test_alternating_languages(self):
         """Test code-switching between languages (simulated)"""
-        mixed_events = [
-            ("Hello everyone", 1000),
-            ("Bonjour", 1500),
-            ("How are you", 2000),
-            ("Comment allez-vous", 2500),
-            ("Let's begin", 3000),
-            ("Commençons", 3500),
-        ]
-
-        results = []
-        fragments = []
-
-        for text, timestamp in mixed_events:
-            result, fragments = self.punct_processor.process_transcript(text, True, timestamp, fragments)
-            if result:
-                results.append(result)
+        results, _ = self.punct_processor.process_transcripts(final_items(_MIXED_EVENTS), [])
 
         # Should handle language switches
         all_text = " ".join(results)
@@ -418,27 +348,7 @@ class TestEdgeCaseHandling(unittest.TestCase):
 
     def test_numbers_only_input(self):
         """Test input consisting only of numbers"""
-        numeric_events = [
-            ("123", 1000),
-            ("456", 1200),
-            ("789", 1400),
-            ("3.14159", 2000),
-            ("2.71828", 2200),
-        ]
-
-        results = []
-        fragments = []
-
-        for text, timestamp in numeric_events:
-            result, fragments = self.punct_processor.process_transcript(text, True, timestamp, fragments)
-            if result:
-                results.append(result)
-
-        # Flush remaining
-        if fragments:
-            final_result, _ = self.punct_processor.flush_pending_fragments(fragments)
-            if final_result:
-                results.append(final_result)
+        results = run_stream(self.punct_processor, final_items(_NUMERIC_EVENTS))
 
         all_text = " ".join(results)
         # Should preserve numbers
@@ -447,33 +357,9 @@ class TestEdgeCaseHandling(unittest.TestCase):
 
     def test_special_characters_stress_test(self):
         """Test various special characters and symbols"""
-        special_events = [
-            ("Hello @user", 1000),
-            ("#trending topic", 1200),
-            ("50% off", 1400),
-            ("$99.99", 1600),
-            ("C++ programming", 1800),
-            ("A/B testing", 2000),
-            ("24/7 support", 2200),
-        ]
-
-        results = []
-        fragments = []
-
-        for text, timestamp in special_events:
-            result, fragments = self.punct_processor.process_transcript(text, True, timestamp, fragments)
-            if result:
-                results.append(result)
+        results, _ = self.punct_processor.process_transcripts(final_items(_SPECIAL_EVENTS), [])
 
         all_text = " ".join(results)
         # Should preserve special characters
-        self.assertIn("@", all_text)
-        self.assertIn("#", all_text)
-        self.assertIn("%", all_text)
-        self.assertIn("$", all_text)
-        self.assertIn("++", all_text)
-        self.assertIn("/", all_text)
-
-
-if __name__ == "__main__":
-    unittest.main(verbosity=2)
+        missing = [symbol for symbol in ("@", "#", "%", "$", "++", "/") if symbol not in all_text]
+        self.assertFalse(missing, f"Missing: {missing}")